@@ -23,6 +23,23 @@ from ..mx_nodes.nodes import get_mx_node_cls
 from . import log
 
 
+# identity elements of arithmetic operations: {op node: (value, is commutative)}
+IDENTITY_VALUES = {
+    'add': (0.0, True),
+    'subtract': (0.0, False),
+    'multiply': (1.0, True),
+    'divide': (1.0, False),
+    'power': (1.0, False),
+}
+
+
+def is_identity(data, value):
+    if isinstance(data, float):
+        return data == value
+
+    return isinstance(data, tuple) and all(v == value for v in data)
+
+
 class Id:
     def __init__(self):
         self.id = 0
@@ -110,6 +127,16 @@ class NodeItem:
                     result_data = tuple(map(func, data, other_data))
 
             else:
+                # operation with identity element returns the other operand without creating node
+                identity = IDENTITY_VALUES.get(op_node)
+                if identity and isinstance(self.data, mx.Node) and \
+                        is_identity(other_data, identity[0]):
+                    return self
+
+                if identity and identity[1] and isinstance(other_data, mx.Node) and \
+                        is_identity(self.data, identity[0]):
+                    return self.node_item(other)
+
                 nd_type = self.data.getType() if isinstance(self.data, mx.Node) else \
                           other_data.getType()
 
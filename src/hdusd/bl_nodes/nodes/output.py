@@ -13,6 +13,7 @@
 # limitations under the License.
 #********************************************************************
 from ..node_parser import NodeParser, Id
+from .. import optimizer
 
 
 class ShaderNodeOutputMaterial(NodeParser):
@@ -39,4 +40,5 @@ class ShaderNodeOutputMaterial(NodeParser):
             'surfaceshader': surface,
         })
 
+        optimizer.optimize(self.doc)
         return result
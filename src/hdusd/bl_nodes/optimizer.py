@@ -0,0 +1,305 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Optimization of MaterialX documents generated from Blender shader nodes.
+Nodes with constant inputs are folded to values, identical nodes are merged into one
+and nodes which aren't reachable from materials are removed.
+"""
+import math
+
+import MaterialX as mx
+
+from ..utils import mx as mx_utils
+from . import log
+
+
+# arithmetic nodes which are folded if all their inputs are values: {category: (inputs, func)},
+# func is applied per component, float value is broadcasted to all components
+FOLDED_NODES = {
+    'add': (('in1', 'in2'), lambda a, b: a + b),
+    'subtract': (('in1', 'in2'), lambda a, b: a - b),
+    'multiply': (('in1', 'in2'), lambda a, b: a * b),
+    'divide': (('in1', 'in2'), lambda a, b: a / b),
+    'modulo': (('in1', 'in2'), lambda a, b: a % b),
+    'power': (('in1', 'in2'), lambda a, b: a ** b),
+    'min': (('in1', 'in2'), min),
+    'max': (('in1', 'in2'), max),
+    'absval': (('in',), abs),
+    'floor': (('in',), math.floor),
+    'ceil': (('in',), math.ceil),
+    'sin': (('in',), math.sin),
+    'cos': (('in',), math.cos),
+    'tan': (('in',), math.tan),
+    'asin': (('in',), math.asin),
+    'acos': (('in',), math.acos),
+    'atan': (('in',), math.atan),
+    'ln': (('in',), math.log),
+    'sqrt': (('in',), math.sqrt),
+    'exp': (('in',), math.exp),
+}
+
+TYPE_SIZES = {
+    'float': 1,
+    'vector2': 2,
+    'vector3': 3,
+    'color3': 3,
+    'vector4': 4,
+    'color4': 4,
+}
+
+CONNECTION_ATTRS = ('nodename', 'nodegraph', 'output')
+
+
+def get_graphs(doc):
+    """Returns document and all its nodegraphs, parent graphs go after their children"""
+    graphs = [elem for elem in doc.traverseTree() if isinstance(elem, mx.NodeGraph)]
+    graphs.reverse()
+    graphs.append(doc)
+    return graphs
+
+
+def get_nodes_count(doc):
+    return sum(len(graph.getNodes()) for graph in get_graphs(doc))
+
+
+def get_ref(graph, mx_input):
+    """
+    Returns (graph, node name, output) of node connected to input of node in graph,
+    connections through nodegraph outputs are resolved to nodes inside of nodegraph
+    """
+    node_name = mx_input.getNodeName()
+    if node_name:
+        return graph, node_name, mx_input.getAttribute('output')
+
+    ng_name = mx_input.getNodeGraphString()
+    if ng_name:
+        nodegraph = graph.getChild(ng_name)
+        mx_output = nodegraph.getOutput(mx_input.getAttribute('output')) \
+            if isinstance(nodegraph, mx.NodeGraph) else None
+        if mx_output and mx_output.getNodeName():
+            return nodegraph, mx_output.getNodeName(), mx_output.getAttribute('output')
+
+    return None
+
+
+def get_value(mx_input):
+    """Returns float or tuple value of not connected input, None for other values"""
+    if any(mx_input.hasAttribute(attr) for attr in CONNECTION_ATTRS):
+        return None
+
+    val = mx_input.getValue()
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return float(val)
+
+    if hasattr(val, 'asTuple'):
+        return tuple(float(v) for v in val.asTuple())
+
+    return None
+
+
+def sorted_nodes(graph):
+    """Returns nodes of graph in topological order: inputs go before nodes they are connected to"""
+    result = []
+    visited = set()
+
+    def visit(node):
+        if node.getName() in visited:
+            return
+
+        visited.add(node.getName())
+        for mx_input in node.getInputs():
+            node_name = mx_input.getNodeName()
+            input_node = graph.getNode(node_name) if node_name else None
+            if input_node:
+                visit(input_node)
+
+        result.append(node)
+
+    for node in graph.getNodes():
+        visit(node)
+
+    return result
+
+
+def fold_node(node):
+    """Returns value of node computed from its input values or None if node can't be folded"""
+    folded = FOLDED_NODES.get(node.getCategory())
+    size = TYPE_SIZES.get(node.getType())
+    if not folded or not size:
+        return None
+
+    input_names, func = folded
+    if sorted(mx_input.getName() for mx_input in node.getInputs()) != sorted(input_names):
+        return None
+
+    values = [get_value(node.getInput(name)) for name in input_names]
+    if any(val is None or (isinstance(val, tuple) and len(val) != size) for val in values):
+        return None
+
+    try:
+        result = tuple(float(func(*(val if isinstance(val, float) else val[i] for val in values)))
+                       for i in range(size))
+
+    except (ArithmeticError, ValueError, TypeError):
+        return None
+
+    if not all(math.isfinite(v) for v in result):
+        return None
+
+    return result[0] if size == 1 else result
+
+
+def fold_constants(doc):
+    """Replaces connections to nodes with constant inputs by their computed values"""
+    graphs = get_graphs(doc)
+
+    consumers = {}      # {(graph path, node name): [input]}
+    for graph in graphs:
+        for node in graph.getNodes():
+            for mx_input in node.getInputs():
+                ref = get_ref(graph, mx_input)
+                if ref and not ref[2]:
+                    consumers.setdefault((ref[0].getNamePath(), ref[1]), []).append(mx_input)
+
+    count = 0
+    for graph in graphs:
+        for node in sorted_nodes(graph):
+            node_inputs = consumers.get((graph.getNamePath(), node.getName()))
+            if not node_inputs or any(mx_input.getType() != node.getType()
+                                      for mx_input in node_inputs):
+                continue
+
+            value = fold_node(node)
+            if value is None:
+                continue
+
+            for mx_input in node_inputs:
+                for attr in CONNECTION_ATTRS:
+                    mx_input.removeAttribute(attr)
+
+                mx_utils.set_param_value(mx_input, value, mx_input.getType())
+
+            count += 1
+
+    return count
+
+
+def merge_duplicates(doc):
+    """Merges nodes with the same category, attributes and inputs to one node"""
+    count = 0
+    for graph in get_graphs(doc):
+        canonical_nodes = {}    # {node key: node name}
+        renamed = {}            # {duplicated node name: canonical node name}
+        for node in sorted_nodes(graph):
+            # input nodes go before this node, so their duplicates are already known
+            for mx_input in node.getInputs():
+                node_name = mx_input.getNodeName()
+                if node_name in renamed:
+                    mx_input.setNodeName(renamed[node_name])
+
+            inputs = []
+            for mx_input in node.getInputs():
+                ref = get_ref(graph, mx_input)
+                inputs.append((mx_input.getName(), mx_input.getType(),
+                               (ref[0].getNamePath(), ref[1], ref[2]) if ref
+                               else mx_input.getValueString()))
+
+            key = (node.getCategory(), node.getType(),
+                   tuple(sorted((name, node.getAttribute(name))
+                                for name in node.getAttributeNames() if name != 'name')),
+                   tuple(sorted(inputs)))
+
+            if key in canonical_nodes:
+                renamed[node.getName()] = canonical_nodes[key]
+            else:
+                canonical_nodes[key] = node.getName()
+
+        if not renamed:
+            continue
+
+        for mx_output in graph.getOutputs():
+            if mx_output.getNodeName() in renamed:
+                mx_output.setNodeName(renamed[mx_output.getNodeName()])
+
+        for node_name in renamed:
+            graph.removeNode(node_name)
+
+        count += len(renamed)
+
+    return count
+
+
+def remove_unreachable(doc):
+    """Removes nodes, nodegraph outputs and nodegraphs which materials don't depend on"""
+    graphs = get_graphs(doc)
+    roots = [(doc, node) for node in doc.getNodes() if node.getType() == 'material']
+    if not roots:
+        return 0
+
+    reachable = set()       # {(graph path, node name)}
+    used_outputs = set()    # {(graph path, output name)}
+    nodes_to_check = roots
+    while nodes_to_check:
+        graph, node = nodes_to_check.pop()
+        key = (graph.getNamePath(), node.getName())
+        if key in reachable:
+            continue
+
+        reachable.add(key)
+        for mx_input in node.getInputs():
+            ref = get_ref(graph, mx_input)
+            if not ref:
+                continue
+
+            ref_graph, node_name, _ = ref
+            if ref_graph is not graph:
+                used_outputs.add((ref_graph.getNamePath(), mx_input.getAttribute('output')))
+
+            input_node = ref_graph.getNode(node_name)
+            if input_node:
+                nodes_to_check.append((ref_graph, input_node))
+
+    count = 0
+    for graph in graphs:
+        graph_path = graph.getNamePath()
+        for node in graph.getNodes():
+            if (graph_path, node.getName()) not in reachable:
+                graph.removeNode(node.getName())
+                count += 1
+
+        if graph is doc:
+            continue
+
+        for mx_output in graph.getOutputs():
+            if (graph_path, mx_output.getName()) not in used_outputs:
+                graph.removeOutput(mx_output.getName())
+
+        if not graph.getNodes() and not graph.getOutputs():
+            graph.getParent().removeChild(graph.getName())
+
+    return count
+
+
+def optimize(doc):
+    """Optimizes generated doc in place, returns number of nodes before and after optimization"""
+    nodes_count = get_nodes_count(doc)
+    folded_count = fold_constants(doc)
+    merged_count = merge_duplicates(doc)
+    removed_count = remove_unreachable(doc)
+    result_count = get_nodes_count(doc)
+
+    log(f"Optimize: {nodes_count} -> {result_count} nodes; folded: {folded_count}, "
+        f"merged: {merged_count}, removed: {removed_count}")
+    return nodes_count, result_count
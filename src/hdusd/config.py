@@ -21,9 +21,14 @@ logging_backups = 5
 matlib_enabled = True
 engine_use_preview = True
 usd_mesh_assign_material_enabled = False
+usd_nodes_memo_size = 512      # memory budget of USD nodes memo cache in MB
+usd_nodes_cache_size = 4096    # disk budget of Cache node files in MB
 
 # dev settings
 show_dev_settings = False
+# USD nodes dev checks: error is raised if node is computed twice per evaluation
+# or if USD File node stage composes excluded prims or payloads
+usd_nodes_strict_evaluation = False
 
 
 try:
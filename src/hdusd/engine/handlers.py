@@ -22,14 +22,26 @@ from .engine import log
 def on_load_pre(*args):
     """Handler on loading a blend file (before)"""
     log("on_load_pre", args)
+    from ..mx_nodes import node_tree as mx_node_tree
+    from ..usd_nodes import opened_stages
+    from ..usd_nodes.memo import memo_cache
+
+    # stages of previous file aren't used anymore, its nodes are released without free()
+    opened_stages.clear()
+    memo_cache.clear()
+
     utils.clear_temp_dir()
+    mx_node_tree.clear_docs()
 
 
 @bpy.app.handlers.persistent
 def on_load_post(*args):
     """Handler on loading a blend file (after)"""
     log("on_load_post", args)
+    from ..mx_nodes import nodes as mx_nodes
     from ..usd_nodes import node_tree
+
+    mx_nodes.register_used_mx_nodes(True)
     node_tree.reset()
 
 
@@ -46,6 +58,11 @@ def on_depsgraph_update_post(scene, depsgraph):
     from ..properties import object, material
     from ..usd_nodes import node_tree
     from ..ui import material as material_ui
+    from ..mx_nodes import nodes as mx_nodes
+
+    # MaterialX node trees could be appended or linked from another file,
+    # they are checked only if number of node groups was changed
+    mx_nodes.register_used_mx_nodes()
 
     object.depsgraph_update(depsgraph)
     material.depsgraph_update(depsgraph)
@@ -66,6 +83,15 @@ def no_depsgraph_update_call(op, *args, **kwargs):
         _do_depsgraph_update = True
 
 
+@bpy.app.handlers.persistent
+def on_undo_redo_post(*args):
+    """Handler after undo or redo, restored data could differ from cached exported data"""
+    log("on_undo_redo_post", args)
+    from ..mx_nodes import node_tree as mx_node_tree
+
+    mx_node_tree.clear_docs()
+
+
 @bpy.app.handlers.persistent
 def on_frame_change_post(scene, depsgraph):
     """Handler on frame change a blend file (after)"""
@@ -79,7 +105,10 @@ def on_frame_change_post(scene, depsgraph):
 def on_save_pre(*args):
     log("on_save_pre", args)
     from ..viewport import usd_collection
+    from ..mx_nodes import nodes as mx_nodes
+
     usd_collection.scene_save_pre()
+    mx_nodes.save_used_families()
 
 
 @bpy.app.handlers.persistent
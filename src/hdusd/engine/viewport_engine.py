@@ -16,12 +16,13 @@ from dataclasses import dataclass
 import textwrap
 import weakref
 import time
+import math
 
 import bpy
 import bgl
 from bpy_extras import view3d_utils
 
-from pxr import Usd, UsdGeom, Tf, Gf, Glf
+from pxr import Usd, UsdGeom, Sdf, Tf, Gf, Glf
 from pxr import UsdImagingGL
 
 from .engine import Engine
@@ -32,6 +33,10 @@ from ..utils import logging
 log = logging.Log('viewport_engine')
 
 
+# initial number of pending objects resolved in depsgraph at once during progressive sync
+PROGRESSIVE_SYNC_BATCH_SIZE = 64
+
+
 @dataclass(init=False, eq=True)
 class ViewSettings:
     """
@@ -47,6 +52,33 @@ class ViewSettings:
     screen_height: int
     border: tuple
 
+    @staticmethod
+    def key(context: bpy.types.Context):
+        """
+        Returns cheap comparable key of context data which ViewSettings depends on.
+        It is used to skip recalculation of ViewSettings when viewport view is not changed.
+        """
+        region_data = context.region_data
+        space_data = context.space_data
+        render = context.scene.render
+
+        key = (
+            tuple(map(tuple, region_data.view_matrix)),
+            context.region.width, context.region.height,
+            region_data.view_perspective, region_data.view_distance,
+            space_data.lens, space_data.clip_start, space_data.clip_end,
+        )
+
+        if region_data.view_perspective == 'CAMERA':
+            key += (region_data.view_camera_zoom, tuple(region_data.view_camera_offset),
+                    render.use_border, render.border_min_x, render.border_max_x,
+                    render.border_min_y, render.border_max_y)
+        elif space_data.use_render_border:
+            key += (space_data.render_border_min_x, space_data.render_border_max_x,
+                    space_data.render_border_min_y, space_data.render_border_max_y)
+
+        return key
+
     def __init__(self, context: bpy.types.Context):
         """Initializes settings from Blender's context"""
         self.camera_data = camera.CameraData.init_from_context(context)
@@ -120,6 +152,79 @@ class ViewSettings:
              (self.border[1][0] / self.screen_width, self.border[1][1] / self.screen_height)))
 
 
+class PlaybackCache:
+    """
+    Holds time samples of animated objects in a separate layer of engine stage.
+    Time samples are authored during the first playback of animation, after that playback
+    requires only changing of render frame.
+    """
+
+    def __init__(self, stage, frame):
+        self.layer = Sdf.Layer.CreateAnonymous("playback_cache")
+        # cache layer has to be the strongest one to override default values of root layer
+        stage.GetRootLayer().subLayerPaths.insert(0, self.layer.identifier)
+
+        self.frames = set()
+
+        # cached objects: {sdf_name: (is_updated_geometry, is_updated_transform)}
+        self.objects = {}
+        self.last_frame = frame
+
+    def clear(self):
+        """Clears time samples, returns cached objects which have to be synced again"""
+        objects = self.objects
+        if not self.frames and not objects:
+            return objects
+
+        log("PlaybackCache.clear", len(self.frames), len(objects))
+        self.layer.Clear()
+        self.frames = set()
+        self.objects = {}
+        return objects
+
+    def remove_object(self, sdf_name):
+        """
+        Removes time samples of object, which is synced again in root layer. Cached frames
+        miss samples of this object now, therefore they have to be cached again.
+        """
+        path = Sdf.Path.absoluteRootPath.AppendChild(sdf_name)
+        if not self.layer.GetPrimAtPath(path):
+            return
+
+        log("PlaybackCache.remove_object", sdf_name)
+        edit = Sdf.BatchNamespaceEdit()
+        edit.Add(path, Sdf.Path.emptyPath)
+        self.layer.Apply(edit)
+
+        self.objects.pop(sdf_name, None)
+        self.frames = set()
+
+    def sync_frame(self, root_prim, frame, object_updates):
+        """
+        Authors time samples of updated objects for frame. Returns object updates which
+        couldn't be cached, frame is marked as cached only if all updates were cached.
+        """
+        stage = root_prim.GetStage()
+        time_code = Usd.TimeCode(frame)
+
+        not_cached = []
+        with Usd.EditContext(stage, self.layer):
+            for obj_data, is_updated_geometry, is_updated_transform in object_updates:
+                if not object.sync_time_sample(root_prim, obj_data, time_code,
+                                               is_updated_geometry, is_updated_transform):
+                    not_cached.append((obj_data, is_updated_geometry, is_updated_transform))
+                    continue
+
+                is_geometry, is_transform = self.objects.get(obj_data.sdf_name, (False, False))
+                self.objects[obj_data.sdf_name] = (is_geometry or is_updated_geometry,
+                                                   is_transform or is_updated_transform)
+
+        if not not_cached:
+            self.frames.add(frame)
+
+        return not_cached
+
+
 class ViewportEngine(Engine):
     """ Basic Viewport render engine """
 
@@ -145,6 +250,10 @@ class ViewportEngine(Engine):
         super().__init__(rpr_engine)
 
         self.view_settings = None
+        self.view_settings_key = None
+        self.gf_camera = None
+        self.render_resolution = None
+        self.time_last_motion = 0.0
         self.renderer = None
         self.render_params = None
 
@@ -230,6 +339,10 @@ class ViewportEngine(Engine):
         if self.renderer.IsPauseRendererSupported():
             self.renderer.ResumeRenderer()
 
+        # camera data could be changed or renderer could be recreated,
+        # therefore camera state has to be set again on next draw
+        self.view_settings_key = None
+
         self.render_engine.tag_redraw()
 
     def _sync(self, context, depsgraph):
@@ -253,17 +366,25 @@ class ViewportEngine(Engine):
         if not stage:
             return
 
-        view_settings = ViewSettings(context)
-        if view_settings.width * view_settings.height == 0:
+        view_settings_key = ViewSettings.key(context)
+        if view_settings_key != self.view_settings_key:
+            # first element of the key is view matrix, its change means viewport navigation
+            if self.view_settings_key and self.view_settings_key[0] != view_settings_key[0]:
+                self.time_last_motion = time.perf_counter()
+
+            self.view_settings_key = view_settings_key
+            self.view_settings = ViewSettings(context)
+            self.gf_camera = None
+
+            if self.view_settings.width * self.view_settings.height != 0:
+                self._set_view_settings()
+
+        if self.gf_camera is None:
             return
 
-        gf_camera = view_settings.export_camera()
-        self.renderer.SetCameraState(gf_camera.frustum.ComputeViewMatrix(),
-                                     gf_camera.frustum.ComputeProjectionMatrix())
-        self.renderer.SetRenderViewport((*view_settings.border[0], *view_settings.border[1]))
-        self.renderer.SetRendererAov('color')
-        self.render_params.renderResolution = (view_settings.width, view_settings.height)
-        self.render_params.clipPlanes = [Gf.Vec4d(i) for i in gf_camera.clippingPlanes]
+        gf_camera = self.gf_camera
+
+        is_navigating = self._update_render_resolution(context.scene)
 
         if self.is_gl_delegate:
             l = Glf.SimpleLight()
@@ -299,12 +420,50 @@ class ViewportEngine(Engine):
         bgl.glClear(bgl.GL_DEPTH_BUFFER_BIT)
 
         elapsed_time = time_str(time.perf_counter() - self.time_begin)
+        resolution = f"Resolution: {self.render_resolution[0]}x{self.render_resolution[1]}"
         if not self.renderer.IsConverged():
             self.notify_status(f"Time: {elapsed_time} | "
-                               f"Done: {int(usd_utils.get_renderer_percent_done(self.renderer))}%",
+                               f"Done: {int(usd_utils.get_renderer_percent_done(self.renderer))}% | "
+                               f"{resolution}",
                                "Render")
         else:
-            self.notify_status(f"Time: {elapsed_time}", "Rendering Done", False)
+            # while navigating we need next redraw to restore full resolution after idle time
+            self.notify_status(f"Time: {elapsed_time} | {resolution}", "Rendering Done",
+                               is_navigating)
+
+    def _set_view_settings(self):
+        """Applies current self.view_settings to renderer and render params"""
+        view_settings = self.view_settings
+
+        gf_camera = view_settings.export_camera()
+        self.renderer.SetCameraState(gf_camera.frustum.ComputeViewMatrix(),
+                                     gf_camera.frustum.ComputeProjectionMatrix())
+        self.renderer.SetRenderViewport((*view_settings.border[0], *view_settings.border[1]))
+        self.renderer.SetRendererAov('color')
+        self.render_params.clipPlanes = [Gf.Vec4d(i) for i in gf_camera.clippingPlanes]
+
+        self.gf_camera = gf_camera
+        self.render_resolution = None
+
+    def _update_render_resolution(self, scene):
+        """
+        Sets reduced render resolution during viewport navigation and restores full resolution
+        after idle time. Returns True if viewport is being navigated.
+        """
+        settings = self.get_settings(scene)
+
+        width, height = self.view_settings.width, self.view_settings.height
+        is_navigating = settings.use_adaptive_resolution and \
+            time.perf_counter() - self.time_last_motion < settings.adaptive_resolution_idle_time
+        if is_navigating:
+            scale = settings.adaptive_resolution_scale
+            width, height = max(int(width * scale), 1), max(int(height * scale), 1)
+
+        if self.render_resolution != (width, height):
+            self.render_resolution = (width, height)
+            self.render_params.renderResolution = self.render_resolution
+
+        return is_navigating
 
     def _sync_render_settings(self, scene):
         settings = self.get_settings(scene)
@@ -356,6 +515,16 @@ class ViewportEngine(Engine):
 class ViewportEngineScene(ViewportEngine):
     """Viewport engine for rendering Blender current scene"""
 
+    def __init__(self, rpr_engine):
+        super().__init__(rpr_engine)
+
+        # keys of objects waiting for progressive sync, see ObjectData.key
+        self.pending_objects = []
+        self.pending_objects_count = 0
+        self.synced_objects_count = 0
+
+        self.playback_cache = None
+
     @classmethod
     def material_update(cls, material):
         for engine in cls.get_engines():
@@ -378,18 +547,96 @@ class ViewportEngineScene(ViewportEngine):
 
         root_prim = stage.GetPseudoRoot()
 
-        for obj_data in object.ObjectData.depsgraph_objects(
-                depsgraph,
-                space_data=self.space_data, use_scene_cameras=False,
-                use_scene_lights=self.shading_data.use_scene_lights):
-            object.sync(root_prim, obj_data)
+        objects = object.ObjectData.depsgraph_objects(
+            depsgraph,
+            space_data=self.space_data, use_scene_cameras=False,
+            use_scene_lights=self.shading_data.use_scene_lights)
+
+        if self.get_settings(depsgraph.scene).use_progressive_sync:
+            # objects are synced by time-sliced batches in draw() and sync_update()
+            self.synced_objects_count = 0
+            self._set_pending_objects(context, objects)
+
+        else:
+            for obj_data in objects:
+                object.sync(root_prim, obj_data)
 
         world.sync(root_prim, depsgraph.scene.world, self.shading_data)
         self.render_params.clearColor = world.get_clear_color(root_prim)
 
+    def _set_pending_objects(self, context, objects):
+        """
+        Puts objects to the queue of progressive sync.
+        Lights go first, then objects sorted by their size relatively to distance to the view.
+        """
+        view_pos = context.region_data.view_matrix.inverted().translation
+
+        def priority(obj_data):
+            if obj_data.object.type == 'LIGHT':
+                return math.inf
+
+            # obj_data.transform is transposed, so translation is in the last row
+            distance = (obj_data.transform[3].xyz - view_pos).length
+            return obj_data.object.dimensions.length / max(distance, 1e-3)
+
+        # queue is sorted in reversed order to pop objects from the end,
+        # evaluated data isn't kept in the queue, it could be freed by next depsgraph evaluation
+        self.pending_objects = [obj_data.key for obj_data in sorted(objects, key=priority)]
+
+        # objects synced before the queue was rebuilt are kept in total count
+        self.pending_objects_count = self.synced_objects_count + len(self.pending_objects)
+
+    def _sync_pending_objects(self, depsgraph):
+        """Syncs pending objects until time slice of progressive sync is over"""
+        if not self.pending_objects:
+            return
+
+        time_end = time.perf_counter() + self.get_settings(depsgraph.scene).progressive_sync_time
+        root_prim = self.stage.GetPseudoRoot()
+
+        # pending objects are resolved in current depsgraph by batches,
+        # depsgraph instances are scanned once per sync pass
+        instances = None
+        batch_size = PROGRESSIVE_SYNC_BATCH_SIZE
+        while self.pending_objects and time.perf_counter() < time_end:
+            keys = self.pending_objects[-batch_size:]
+            if instances is None and any(key[2] != 0 for key in keys):
+                instances = object.ObjectData.instances_from_keys(depsgraph, self.pending_objects)
+
+            objects = object.ObjectData.from_keys(depsgraph, keys, instances,
+                                                  space_data=self.space_data)
+
+            for key in reversed(keys):
+                if time.perf_counter() >= time_end:
+                    break
+
+                self.pending_objects.pop()
+                self.synced_objects_count += 1
+
+                obj_data = objects.get(key)
+                if obj_data:
+                    object.sync(root_prim, obj_data)
+                else:
+                    log("Skipping removed or hidden object during progressive sync", key)
+
+            batch_size *= 2
+
+    def draw(self, context):
+        if self.is_synced and self.pending_objects:
+            self._sync_pending_objects(context.evaluated_depsgraph_get())
+
+        super().draw(context)
+
+        if self.pending_objects:
+            synced_count = self.pending_objects_count - len(self.pending_objects)
+            self.notify_status(f"Objects: {synced_count}/{self.pending_objects_count}",
+                               "Syncing")
+
     def _sync_update(self, context, depsgraph):
         super()._sync_update(context, depsgraph)
 
+        self._sync_pending_objects(depsgraph)
+
         root_prim = self.stage.GetPseudoRoot()
 
         shading_data = world.ShadingData(context, depsgraph.scene.world)
@@ -397,6 +644,7 @@ class ViewportEngineScene(ViewportEngine):
         update_collection = self.shading_data.use_scene_lights != shading_data.use_scene_lights
         self.shading_data = shading_data
 
+        object_updates = []
         for update in depsgraph.updates:
             log("sync_update", update.id, type(update.id))
 
@@ -413,16 +661,13 @@ class ViewportEngineScene(ViewportEngine):
                     continue
 
                 obj_data = object.ObjectData.from_object(obj)
-
-                object.sync_update(root_prim, obj_data,
-                                   update.is_updated_geometry,
-                                   update.is_updated_transform,
-                                   is_gl_delegate=self.is_gl_delegate)
+                object_updates.append((obj_data, update.is_updated_geometry,
+                                       update.is_updated_transform))
 
                 for inst_obj_data in object.ObjectData.depsgraph_objects_inst(depsgraph):
                     if obj_data.sdf_name == object.sdf_name(inst_obj_data.object):
-                        object.sync_update(root_prim, inst_obj_data, update.is_updated_geometry,
-                                           update.is_updated_transform)
+                        object_updates.append((inst_obj_data, update.is_updated_geometry,
+                                               update.is_updated_transform))
 
                 continue
 
@@ -430,14 +675,69 @@ class ViewportEngineScene(ViewportEngine):
                 update_world = True
                 continue
 
+        playback_frame = self._get_playback_frame(depsgraph.scene)
+        if playback_frame is not None:
+            if playback_frame in self.playback_cache.frames:
+                # all animated changes of this frame are already in playback cache
+                object_updates = []
+            else:
+                object_updates = self.playback_cache.sync_frame(root_prim, playback_frame,
+                                                                object_updates)
+
+        elif self.playback_cache and \
+                (object_updates or not self.get_settings(depsgraph.scene).use_playback_cache):
+            # objects were edited or cache was disabled,
+            # time samples in playback cache are not actual anymore
+            object_updates += self._clear_playback_cache(depsgraph)
+
+        for obj_data, is_updated_geometry, is_updated_transform in object_updates:
+            if self.playback_cache:
+                # stronger playback cache layer mustn't override synced object
+                self.playback_cache.remove_object(obj_data.sdf_name)
+
+            object.sync_update(root_prim, obj_data, is_updated_geometry, is_updated_transform,
+                               is_gl_delegate=self.is_gl_delegate)
+
         if update_collection:
-            self._sync_objects_collection(depsgraph)
+            self._sync_objects_collection(context, depsgraph)
 
         if update_world:
             world.sync_update(root_prim, depsgraph.scene.world, self.shading_data)
             self.render_params.clearColor = world.get_clear_color(root_prim)
 
-    def _sync_objects_collection(self, depsgraph):
+    def _get_playback_frame(self, scene):
+        """
+        Returns current frame if object updates have to be processed through playback cache,
+        otherwise None. Object updates come through playback cache only after frame change,
+        other updates are edits of objects.
+        """
+        if not self.get_settings(scene).use_playback_cache:
+            return None
+
+        frame = scene.frame_current
+        if not self.playback_cache:
+            self.playback_cache = PlaybackCache(self.stage, frame)
+        is_frame_changed = frame != self.playback_cache.last_frame
+        self.playback_cache.last_frame = frame
+
+        if not is_frame_changed or not scene.frame_start <= frame <= scene.frame_end:
+            return None
+
+        return frame
+
+    def _clear_playback_cache(self, depsgraph):
+        """Clears playback cache, returns object updates to sync actual state of cached objects"""
+        cached_objects = self.playback_cache.clear()
+        if not cached_objects:
+            return []
+
+        return [(obj_data, *cached_objects[obj_data.sdf_name])
+                for obj_data in object.ObjectData.depsgraph_objects(
+                    depsgraph, space_data=self.space_data,
+                    use_scene_lights=self.shading_data.use_scene_lights, use_scene_cameras=False)
+                if obj_data.sdf_name in cached_objects]
+
+    def _sync_objects_collection(self, context, depsgraph):
         root_prim = self.stage.GetPseudoRoot()
 
         def dg_objects():
@@ -452,11 +752,21 @@ class ViewportEngineScene(ViewportEngine):
         keys_to_remove = usd_object_keys - depsgraph_keys
         keys_to_add = depsgraph_keys - usd_object_keys
 
+        if self.playback_cache:
+            for key in keys_to_remove | keys_to_add:
+                self.playback_cache.remove_object(key)
+
         if keys_to_remove:
             log("Object keys to remove", keys_to_remove)
             for key in keys_to_remove:
                 self.stage.RemovePrim(root_prim.GetPath().AppendChild(key))
 
+        if self.pending_objects:
+            # progressive sync is in progress: rebuilding its queue with actual depsgraph objects
+            self._set_pending_objects(context, (obj_data for obj_data in dg_objects()
+                                                if obj_data.sdf_name in keys_to_add))
+            return
+
         if keys_to_add:
             log("Object keys to add", keys_to_add)
             for obj_data in dg_objects():
@@ -495,19 +805,40 @@ class ViewportEngineNodetree(ViewportEngine):
         self.render_params.clearColor = world_data.clear_color
 
     def nodetree_stage_changed(self, stage):
+        """
+        Updates engine stage with root prims of nodetree stage.
+        Only root prims which were added, removed or got other reference target are changed,
+        therefore Hydra doesn't need to repopulate the whole scene.
+        Root prims are referenced from layers which define them, e.g. inputs of Merge node,
+        so prims of not recomputed inputs keep their reference target.
+        """
         engine_stage = self.stage
         root_prim = engine_stage.GetPseudoRoot()
+        root_layer = engine_stage.GetRootLayer()
 
-        # removing all prims in engine_stage
-        for prim in engine_stage.GetPseudoRoot().GetAllChildren():
-            engine_stage.RemovePrim(prim.GetPath())
-
+        references = {}
         if stage:
-            # creating overrides from nodetree stage
+            layer = stage.GetRootLayer()
             for prim in stage.GetPseudoRoot().GetAllChildren():
-                override_prim = engine_stage.OverridePrim(
-                    root_prim.GetPath().AppendChild(prim.GetName()))
-                override_prim.GetReferences().AddReference(stage.GetRootLayer().realPath,
-                                                           prim.GetPath())
+                source_layer = usd_utils.get_prim_source_layer(layer, prim.GetPath())
+                references[prim.GetName()] = Sdf.Reference(source_layer.realPath, prim.GetPath())
+
+        # removing prims which are absent in nodetree stage
+        for prim in root_prim.GetAllChildren():
+            if prim.GetName() not in references:
+                engine_stage.RemovePrim(prim.GetPath())
+
+        # creating or retargeting overrides from nodetree stage
+        for name, reference in references.items():
+            path = root_prim.GetPath().AppendChild(name)
+            prim_spec = root_layer.GetPrimAtPath(path)
+            if prim_spec and list(prim_spec.referenceList.prependedItems) == [reference]:
+                # the same prim of the same layer is already referenced,
+                # its changes are delivered through composition
+                continue
+
+            override_prim = engine_stage.OverridePrim(path)
+            override_prim.GetReferences().ClearReferences()
+            override_prim.GetReferences().AddReference(reference)
 
         self.render_engine.tag_redraw()
@@ -22,6 +22,57 @@ from ..utils import logging
 log = logging.Log('export.material')
 
 
+# Index of synced material prims and prims bound to them in stages:
+# {root layer identifier: {material session_uid: {material prim path: set of bound prim paths}}},
+# session_uid is kept when material is renamed
+_material_prims = {}
+
+
+def _get_stage_index(stage):
+    identifier = stage.GetRootLayer().identifier
+    stage_index = _material_prims.get(identifier)
+    if stage_index is None:
+        # removing index of released stages
+        for key in tuple(_material_prims.keys()):
+            if not Sdf.Layer.Find(key):
+                del _material_prims[key]
+
+        stage_index = _material_prims[identifier] = {}
+
+    return stage_index
+
+
+def get_material_prims(stage, mat: bpy.types.Material):
+    """Returns {material prim: set of bound prim paths} of synced mat in stage"""
+    mat_index = _material_prims.get(stage.GetRootLayer().identifier, {}).get(mat.session_uid)
+    if not mat_index:
+        return {}
+
+    mat_prims = {}
+    for mat_path, bound_paths in tuple(mat_index.items()):
+        mat_prim = stage.GetPrimAtPath(mat_path)
+        if not mat_prim.IsValid():
+            # material prim was removed with its object
+            del mat_index[mat_path]
+            continue
+
+        mat_prims[mat_prim] = bound_paths
+
+    return mat_prims
+
+
+def bind(prim, mat: bpy.types.Material, usd_mat):
+    """Binds usd_mat synced from mat to prim, binding is added to the index"""
+    bindings = UsdShade.MaterialBindingAPI(prim)
+    bindings.UnbindAllBindings()
+    bindings.Bind(usd_mat)
+
+    # usd_mat path is <material prim>/Materials/<surfacematerial>
+    mat_path = usd_mat.GetPath().GetParentPath().GetParentPath()
+    _get_stage_index(prim.GetStage()).setdefault(mat.session_uid, {}).\
+        setdefault(mat_path, set()).add(prim.GetPath())
+
+
 def sdf_name(mat: bpy.types.Material, input_socket_key='Surface'):
     ret = Tf.MakeValidIdentifier(mat.name_full)
     if input_socket_key != 'Surface':
@@ -30,6 +81,24 @@ def sdf_name(mat: bpy.types.Material, input_socket_key='Surface'):
     return ret
 
 
+def write_mx_file(doc, mx_file):
+    """
+    Writes doc to mx_file. If layer of mx_file is opened in USD, it is updated in place,
+    so stages referencing it get changes through composition. Returns True if layer was updated
+    """
+    xml = mx.writeToXmlString(doc)
+    mx_file.write_text(xml, encoding='utf-8')
+
+    layer = Sdf.Layer.Find(str(mx_file))
+    if not layer:
+        return False
+
+    if not layer.ImportFromString(xml):
+        layer.Reload(True)
+
+    return True
+
+
 def sync(materials_prim, mat: bpy.types.Material, obj: bpy.types.Object):
     """
     If material exists: returns existing material unless force_update is used
@@ -44,7 +113,7 @@ def sync(materials_prim, mat: bpy.types.Material, obj: bpy.types.Object):
         return None
 
     mx_file = utils.get_temp_file(".mtlx", f'{mat.name}{mat.hdusd.mx_node_tree.name if mat.hdusd.mx_node_tree else ""}')
-    mx.writeToXmlFile(doc, str(mx_file))
+    write_mx_file(doc, mx_file)
     surfacematerial = next(node for node in doc.getNodes()
                            if node.getCategory() == 'surfacematerial')
 
@@ -52,6 +121,8 @@ def sync(materials_prim, mat: bpy.types.Material, obj: bpy.types.Object):
 
     override_prim = stage.OverridePrim(materials_prim.GetPath().AppendChild(sdf_name(mat)))
     override_prim.GetReferences().AddReference(f"./{mx_file.name}", "/MaterialX")
+    mat_index = _get_stage_index(stage).setdefault(mat.session_uid, {})
+    mat_index.setdefault(override_prim.GetPath(), set())
 
     usd_mat = UsdShade.Material.Define(stage, override_prim.GetPath().AppendChild('Materials').
                                        AppendChild(surfacematerial.getName()))
@@ -74,13 +145,9 @@ def sync_update(materials_prim, mat: bpy.types.Material, obj: bpy.types.Object):
 
 
 def sync_update_all(root_prim, mat: bpy.types.Material):
-    sdf_mat_name = sdf_name(mat)
-    mat_prims = []
-    for obj_prim in root_prim.GetAllChildren():
-        mat_prim = obj_prim.GetChild(sdf_mat_name)
-        if mat_prim:
-            mat_prims.append(mat_prim)
-
+    """Updates all synced prims of mat in stage of root_prim"""
+    stage = root_prim.GetStage()
+    mat_prims = get_material_prims(stage, mat)
     if not mat_prims:
         return None
 
@@ -89,10 +156,26 @@ def sync_update_all(root_prim, mat: bpy.types.Material):
         # removing rpr_materialx_node in all material_prims
         return None
 
-    mx_file = utils.get_temp_file(".mtlx", f'{mat.name}{mat.hdusd.mx_node_tree.name if mat.hdusd.mx_node_tree else ""}',
-                                  is_rand=True)
-    mx.writeToXmlFile(doc, str(mx_file))
+    mx_file = utils.get_temp_file(".mtlx", f'{mat.name}{mat.hdusd.mx_node_tree.name if mat.hdusd.mx_node_tree else ""}')
+    if not write_mx_file(doc, mx_file):
+        for mat_prim in mat_prims:
+            mat_prim.GetReferences().ClearReferences()
+            mat_prim.GetReferences().AddReference(f"./{mx_file.name}", "/MaterialX")
 
-    for mat_prim in mat_prims:
-        mat_prim.GetReferences().ClearReferences()
-        mat_prim.GetReferences().AddReference(f"./{mx_file.name}", "/MaterialX")
+    # rebinding prims if name of surfacematerial was changed
+    surfacematerial = next(node for node in doc.getNodes()
+                           if node.getCategory() == 'surfacematerial')
+    for mat_prim, bound_paths in mat_prims.items():
+        usd_mat_path = mat_prim.GetPath().AppendChild('Materials').\
+            AppendChild(surfacematerial.getName())
+
+        for path in tuple(bound_paths):
+            prim = stage.GetPrimAtPath(path)
+            if not prim.IsValid():
+                bound_paths.discard(path)
+                continue
+
+            bindings = UsdShade.MaterialBindingAPI(prim)
+            if bindings.GetDirectBindingRel().GetTargets() != [usd_mat_path]:
+                bindings.UnbindAllBindings()
+                bindings.Bind(UsdShade.Material.Define(stage, usd_mat_path))
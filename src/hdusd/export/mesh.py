@@ -16,7 +16,7 @@ from dataclasses import dataclass
 import numpy as np
 import math
 
-from pxr import UsdGeom, Sdf, UsdShade, Vt, Tf, Gf
+from pxr import Usd, UsdGeom, Sdf, Vt, Tf, Gf
 import bpy
 import bmesh
 import mathutils
@@ -235,7 +235,7 @@ def _assign_materials(obj_prim, obj, usd_mesh):
         usd_mat = material.sync(obj_prim, obj.material_slots[0].material, obj)
 
     if usd_mat:
-        UsdShade.MaterialBindingAPI(usd_mesh).Bind(usd_mat)
+        material.bind(usd_mesh.GetPrim(), obj.material_slots[0].material, usd_mat)
 
 
 def sync_update(obj_prim, obj: bpy.types.Object, mesh: bpy.types.Mesh = None, **kwargs):
@@ -250,3 +250,29 @@ def sync_update(obj_prim, obj: bpy.types.Object, mesh: bpy.types.Mesh = None, **
         stage.RemovePrim(child_prim.GetPath())
 
     sync(obj_prim, obj, **kwargs)
+
+
+def sync_time_sample(obj_prim, obj: bpy.types.Object, time_code, mesh: bpy.types.Mesh = None):
+    """
+    Authors points and normals of deformed mesh as time samples at time_code.
+    Returns False if mesh topology was changed and time samples can't be used.
+    """
+    if not mesh:
+        mesh = obj.data
+
+    usd_mesh = UsdGeom.Mesh(obj_prim.GetChild(Tf.MakeValidIdentifier(mesh.name)))
+    if not usd_mesh:
+        return False
+
+    data = MeshData.init_from_mesh(mesh, obj=obj)
+    if not data:
+        return False
+
+    face_vertex_indices = usd_mesh.GetFaceVertexIndicesAttr().Get()
+    if face_vertex_indices is None or len(face_vertex_indices) != len(data.vertex_indices) or \
+            len(usd_mesh.GetPointsAttr().Get(Usd.TimeCode.Default())) != len(data.vertices):
+        return False
+
+    usd_mesh.GetPointsAttr().Set(Vt.Vec3fArray.FromNumpy(data.vertices), time_code)
+    usd_mesh.GetNormalsAttr().Set(Vt.Vec3fArray.FromNumpy(data.normals), time_code)
+    return True
@@ -55,6 +55,66 @@ class ObjectData:
         data.is_particle = bool(instance.particle_system)
         return data
 
+    @property
+    def key(self):
+        """
+        Stable identity of object or instance: name and library of original object
+        and instance id. Unlike ObjectData it could be kept between depsgraph evaluations.
+        """
+        obj = self.object.original
+        return obj.name, obj.library.filepath if obj.library else None, self.instance_id
+
+    @staticmethod
+    def from_keys(depsgraph, keys, instances=None, space_data=None):
+        """
+        Returns {key: ObjectData} of objects and instances found by keys in current depsgraph.
+        Instances are taken from instances: {key: ObjectData} built by instances_from_keys(),
+        objects hidden in viewport of space_data are skipped as in depsgraph_objects().
+        """
+        result = {}
+        for key in keys:
+            name, library, instance_id = key
+            if instance_id != 0:
+                if instances and key in instances:
+                    result[key] = instances[key]
+
+                continue
+
+            obj = bpy.data.objects.get((name, library))
+            if not obj:
+                continue
+
+            obj = obj.evaluated_get(depsgraph)
+            if space_data and not obj.visible_in_viewport_get(space_data):
+                continue
+
+            result[key] = ObjectData.from_object(obj)
+
+        return result
+
+    @staticmethod
+    def instances_from_keys(depsgraph, keys):
+        """
+        Returns {key: ObjectData} of depsgraph instances with keys. Instances are valid only
+        during iteration of depsgraph, so they are scanned once and converted to ObjectData.
+        """
+        instance_keys = {key for key in keys if key[2] != 0}
+        if not instance_keys:
+            return {}
+
+        result = {}
+        for instance in depsgraph.object_instances:
+            if not instance.is_instance:
+                continue
+
+            obj = instance.object.original
+            key = (obj.name, obj.library.filepath if obj.library else None,
+                   abs(instance.random_id))
+            if key in instance_keys:
+                result[key] = ObjectData.from_instance(instance)
+
+        return result
+
     @property
     def sdf_name(self):
         name = Tf.MakeValidIdentifier(self.object.name_full)
@@ -224,3 +284,31 @@ def sync_update(root_prim, obj_data: ObjectData, is_updated_geometry, is_updated
 
         else:
             to_mesh.sync_update(obj_prim, obj, **kwargs)
+
+
+def sync_time_sample(root_prim, obj_data: ObjectData, time_code, is_updated_geometry,
+                     is_updated_transform):
+    """
+    Authors animated transform and deformed mesh of existing object as time samples at time_code.
+    Returns False if object changes can't be represented by time samples.
+    """
+
+    log("sync_time_sample", obj_data.object, obj_data.instance_id, time_code)
+
+    obj_prim = root_prim.GetChild(obj_data.sdf_name)
+    if not obj_prim.IsValid():
+        return False
+
+    if is_updated_geometry:
+        obj = obj_data.object
+        if obj.type != 'MESH' or obj.mode != 'OBJECT':
+            return False
+
+        if not mesh.sync_time_sample(obj_prim, obj, time_code):
+            return False
+
+    if is_updated_transform:
+        xform = UsdGeom.Xform(obj_prim)
+        xform.MakeMatrixXform().Set(Gf.Matrix4d(obj_data.transform), time_code)
+
+    return True
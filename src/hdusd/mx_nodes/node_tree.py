@@ -18,7 +18,7 @@ import MaterialX as mx
 
 import bpy
 
-from .nodes import get_mx_node_cls
+from .nodes import get_mx_node_cls, ensure_mx_node_registered
 from ..utils import mx as mx_utils
 from . import log
 
@@ -29,6 +29,15 @@ NODE_LAYER_SHIFT_Y = 100
 AREA_TO_UPDATE = 'PROPERTIES'
 REGION_TO_UPDATE = 'WINDOW'
 
+# exported documents of MaterialX node trees: {node tree session uid: mx.Document}.
+# Document is kept while tree topology isn't changed, node value changes are patched into it.
+# Session uid is unique in Blender session, unlike name of deleted and then created tree
+_docs = {}
+
+
+def clear_docs():
+    _docs.clear()
+
 
 class MxNodeTree(bpy.types.ShaderNodeTree):
     """
@@ -67,6 +76,18 @@ class MxNodeTree(bpy.types.ShaderNodeTree):
             self._do_update = True
 
     def export(self) -> mx.Document:
+        doc = _docs.get(self.session_uid)
+        if doc is None:
+            doc = self._export()
+            if not doc:
+                return None
+
+            _docs[self.session_uid] = doc
+
+        # copy is returned, because exported document is modified by callers, e.g. texture paths
+        return doc.copy()
+
+    def _export(self):
         output_node = self.output_node
         if not output_node:
             return None
@@ -142,6 +163,7 @@ class MxNodeTree(bpy.types.ShaderNodeTree):
 
                     return import_node(new_mx_node, layer, None, False)
 
+                ensure_mx_node_registered(MxNode_cls.bl_idname)
                 node = self.nodes.new(MxNode_cls.bl_idname)
                 node.name = node_path
                 node.data_type = data_type
@@ -233,6 +255,9 @@ class MxNodeTree(bpy.types.ShaderNodeTree):
         def create_nodes():
             self.nodes.clear()
 
+            ensure_mx_node_registered('hdusd.MxNode_STD_surfacematerial')
+            ensure_mx_node_registered(f'hdusd.MxNode_{node_name}')
+
             mat_node = self.nodes.new('hdusd.MxNode_STD_surfacematerial')
             node = self.nodes.new(f'hdusd.MxNode_{node_name}')
             node.location = (mat_node.location[0] - NODE_LAYER_SEPARATION_WIDTH,
@@ -250,12 +275,47 @@ class MxNodeTree(bpy.types.ShaderNodeTree):
         self.update_()
 
     def update_(self):
+        _docs.pop(self.session_uid, None)
         self.update_links()
+        self._update_materials()
+
+    def update_node_values(self, node):
+        """
+        Called on change of node property, changed values are set to exported document
+        instead of exporting the whole node tree
+        """
+        if not self._do_update:
+            return
+
+        doc = _docs.get(self.session_uid)
+        if doc is None:
+            self.update_()
+            return
+
+        node_path = node.mx_node_path
+        mx_nodegraph = mx_utils.get_nodegraph_by_node_path(doc, node_path)
+        mx_node = mx_nodegraph.getNode(mx_utils.get_node_name_by_node_path(node_path)) \
+            if mx_nodegraph else None
+        if not mx_node:
+            # node doesn't take part in exported document
+            self.tag_redraw()
+            return
 
+        if not node.set_mx_values(mx_node):
+            self.update_()
+            return
+
+        log("update_node_values", self, node)
+        self._update_materials()
+
+    def _update_materials(self):
         for material in bpy.data.materials:
             if material.hdusd.mx_node_tree and material.hdusd.mx_node_tree.name == self.name:
                 material.hdusd.update()
 
+        self.tag_redraw()
+
+    def tag_redraw(self):
         for window in bpy.context.window_manager.windows:
             for area in window.screen.areas:
                 if area.type == AREA_TO_UPDATE:
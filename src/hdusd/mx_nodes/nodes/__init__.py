@@ -13,6 +13,7 @@
 # limitations under the License.
 # ********************************************************************
 import importlib
+import time
 from pathlib import Path
 
 import bpy
@@ -31,17 +32,110 @@ for mod in gen_modules:
 # sorting by category and label
 mx_node_classes = sorted(mx_node_classes, key=lambda cls: (cls.category.lower(), cls.bl_label.lower()))
 
+# Node families are generated modules. MxNode classes have large property sets and their
+# registration is slow, therefore families are registered on demand when their nodes are used.
+# {family name: [MxNode class]}
+mx_node_families = {mod.__name__.split('.')[-1]: mod.mx_node_classes for mod in gen_modules}
+
+# {MxNode bl_idname: family name}
+_mx_node_family_names = {cls.bl_idname: name for name, classes in mx_node_families.items()
+                         for cls in classes}
+
+# names of registered families
+_registered_families = []
+
+# families of nodes of default material, see MxNodeTree.create_basic_nodes(),
+# they are registered with addon
+CORE_FAMILIES = ('gen_stdlib_defs', 'gen_standard_surface')
+
+# ID property of MaterialX node tree with names of families of its nodes, it is saved with
+# .blend file, because node types of not registered families are undefined after loading
+FAMILIES_PROP = 'mx_families'
+
+# number of node groups when used families were checked last time
+_node_groups_count = 0
+
 
 register_sockets, unregister_sockets = bpy.utils.register_classes_factory([
     base_node.MxNodeInputSocket,
     base_node.MxNodeOutputSocket,
 ])
-register_nodes, unregister_nodes = bpy.utils.register_classes_factory(mx_node_classes)
+
+
+def register_family(name):
+    if name in _registered_families:
+        return
+
+    start = time.perf_counter()
+    for cls in mx_node_families[name]:
+        bpy.utils.register_class(cls)
+
+    _registered_families.append(name)
+    log(f"Family {name} registered: {len(mx_node_families[name])} nodes, "
+        f"{time.perf_counter() - start:.3f} s")
+
+
+def ensure_mx_node_registered(bl_idname):
+    """Registers family of MxNode class with bl_idname, should be called before creating the node"""
+    name = _mx_node_family_names.get(bl_idname)
+    if name:
+        register_family(name)
+
+
+def register_all_mx_nodes():
+    for name in mx_node_families:
+        register_family(name)
+
+
+def save_used_families():
+    """Saves families of nodes to MaterialX node trees, called before saving .blend file"""
+    from ..node_tree import MxNodeTree
+
+    for node_tree in bpy.data.node_groups:
+        if not isinstance(node_tree, MxNodeTree) or node_tree.library:
+            continue
+
+        node_tree[FAMILIES_PROP] = sorted({_mx_node_family_names[node.bl_idname]
+                                           for node in node_tree.nodes
+                                           if node.bl_idname in _mx_node_family_names})
+
+
+def register_used_mx_nodes(is_forced=False):
+    """
+    Registers families of nodes of MaterialX node trees by names saved in node trees.
+    All families are registered if node tree was saved without them. Node trees are checked
+    only if number of node groups was changed, e.g. node tree was appended or linked.
+    """
+    global _node_groups_count
+
+    if not is_forced and len(bpy.data.node_groups) == _node_groups_count:
+        return
+
+    _node_groups_count = len(bpy.data.node_groups)
+    if len(_registered_families) == len(mx_node_families):
+        return
+
+    from ..node_tree import MxNodeTree
+    for node_tree in bpy.data.node_groups:
+        if not isinstance(node_tree, MxNodeTree) or not node_tree.nodes:
+            continue
+
+        family_names = node_tree.get(FAMILIES_PROP)
+        if family_names is None:
+            register_all_mx_nodes()
+            return
+
+        for name in family_names:
+            if name in mx_node_families:
+                register_family(name)
 
 
 def register():
     register_sockets()
-    register_nodes()
+
+    for name in CORE_FAMILIES:
+        if name in mx_node_families:
+            register_family(name)
 
     nodeitems_utils.register_node_categories("'HdUSD_MX_NODES", categories.get_node_categories())
 
@@ -49,30 +143,62 @@ def register():
 def unregister():
     nodeitems_utils.unregister_node_categories("'HdUSD_MX_NODES")
 
-    unregister_nodes()
+    for name in reversed(_registered_families):
+        for cls in reversed(mx_node_families[name]):
+            bpy.utils.unregister_class(cls)
+
+    _registered_families.clear()
     unregister_sockets()
 
 
+# {node category: [MxNode class]}, class name is "MxNode_{prefix}_{category}"
+mx_node_classes_by_category = {}
+for cls in mx_node_classes:
+    mx_node_classes_by_category.setdefault(cls.__name__.split('_', 2)[2], []).append(cls)
+
+# {node category: [(params set of nodedef, MxNode class, data type)]}, filled on demand
+# because it requires loading of nodedefs
+_nodedef_params_sets = {}
+
+# {(node category, params set of node): (MxNode class, data type)}
+_mx_node_cls_cache = {}
+
+
+def _params_set(node, out_type):
+    return {f"in_{p.getName()}:{p.getType()}" for p in node.getInputs()} | \
+           {out_type}
+
+
+def _get_nodedef_params_sets(node_name):
+    params_sets = _nodedef_params_sets.get(node_name)
+    if params_sets is None:
+        params_sets = []
+        for cls in mx_node_classes_by_category.get(node_name, ()):
+            for nodedef, data_type in cls.get_nodedefs():
+                nd_outputs = nodedef.getOutputs()
+                nd_params_set = _params_set(nodedef, 'multioutput' if len(nd_outputs) > 1 else
+                                            nd_outputs[0].getType())
+                params_sets.append((nd_params_set, cls, data_type))
+
+        _nodedef_params_sets[node_name] = params_sets
+
+    return params_sets
+
+
 def get_mx_node_cls(mx_node):
     node_name = mx_node.getCategory()
-
-    suffix = f'_{node_name}'
-    classes = tuple(cls for cls in mx_node_classes if cls.__name__.endswith(suffix))
-    if not classes:
+    if node_name not in mx_node_classes_by_category:
         raise KeyError(f"Unable to find MxNode class for {mx_node}")
 
-    def params_set(node, out_type):
-        return {f"in_{p.getName()}:{p.getType()}" for p in node.getInputs()} | \
-               {out_type}
-
-    node_params_set = params_set(mx_node, mx_node.getType())
+    node_params_set = frozenset(_params_set(mx_node, mx_node.getType()))
+    key = (node_name, node_params_set)
+    result = _mx_node_cls_cache.get(key)
+    if result:
+        return result
 
-    for cls in classes:
-        for nodedef, data_type in cls.get_nodedefs():
-            nd_outputs = nodedef.getOutputs()
-            nd_params_set = params_set(nodedef, 'multioutput' if len(nd_outputs) > 1 else
-                                       nd_outputs[0].getType())
-            if node_params_set.issubset(nd_params_set):
-                return cls, data_type
+    for nd_params_set, cls, data_type in _get_nodedef_params_sets(node_name):
+        if node_params_set.issubset(nd_params_set):
+            _mx_node_cls_cache[key] = cls, data_type
+            return cls, data_type
 
     raise TypeError(f"Unable to find suitable nodedef for {mx_node}")
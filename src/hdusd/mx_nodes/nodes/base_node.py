@@ -16,7 +16,7 @@ import MaterialX as mx
 
 import bpy
 
-from ...utils import title_str, code_str, LIBS_DIR, pass_node_reroute, BLENDER_VERSION
+from ...utils import title_str, code_str, pass_node_reroute, BLENDER_VERSION
 from ...utils import mx as mx_utils
 from . import log
 
@@ -90,12 +90,9 @@ class MxNode(bpy.types.ShaderNode):
     @classmethod
     def get_nodedef(cls, data_type):
         if not cls._data_types[data_type]['nd']:
-            # loading nodedefs
-            doc = mx.createDocument()
-            search_path = mx.FileSearchPath(str(mx_utils.MX_LIBS_DIR))
-            mx.readFromXmlFile(doc, str(LIBS_DIR / cls._file_path), searchPath=search_path)
+            # nodedefs are taken from library document shared by all classes
             for val in cls._data_types.values():
-                val['nd'] = doc.getNodeDef(val['nd_name'])
+                val['nd'] = mx_utils.get_lib_nodedef(cls._file_path, val['nd_name'])
 
         return cls._data_types[data_type]['nd']
 
@@ -124,7 +121,7 @@ class MxNode(bpy.types.ShaderNode):
 
     def update_prop(self, context):
         nodetree = self.id_data
-        nodetree.update_()
+        nodetree.update_node_values(self)
 
     def update_data_type(self, context):
         # updating names for inputs and outputs
@@ -337,6 +334,55 @@ class MxNode(bpy.types.ShaderNode):
 
         return mx_node
 
+    def set_mx_values(self, mx_node):
+        """
+        Sets values of not linked inputs to mx_node created by compute().
+        Returns False if inputs of mx_node don't correspond to node and it has to be recomputed.
+        """
+        nodedef = self.nodedef
+        if mx_node.getCategory() != nodedef.getNodeString():
+            return False
+
+        input_names = set()
+        for in_key in range(len(self.inputs)):
+            nd_input = self.get_nodedef_input(in_key)
+            f = nd_input.getAttribute('uifolder')
+            if f and not getattr(self, self._folder_prop_name(f)):
+                continue
+
+            name = nd_input.getName()
+            nd_type = nd_input.getType()
+            mx_input = mx_node.getInput(name)
+            if mx_input and (mx_input.getNodeName() or mx_input.getNodeGraphString()):
+                # linked input
+                input_names.add(name)
+                continue
+
+            if mx_utils.is_shader_type(nd_type) or nd_input.getValue() is None:
+                continue
+
+            if not mx_input or mx_input.getType() != nd_type:
+                return False
+
+            mx_utils.set_param_value(mx_input, self.get_input_default(in_key), nd_type)
+            input_names.add(name)
+
+        for nd_input in mx_utils.get_nodedef_inputs(nodedef, True):
+            f = nd_input.getAttribute('uifolder')
+            if f and not getattr(self, self._folder_prop_name(f)):
+                continue
+
+            name = nd_input.getName()
+            nd_type = nd_input.getType()
+            mx_input = mx_node.getInput(name)
+            if not mx_input or mx_input.getType() != nd_type:
+                return False
+
+            mx_utils.set_param_value(mx_input, self.get_param_value(name), nd_type)
+            input_names.add(name)
+
+        return input_names == set(mx_input.getName() for mx_input in mx_node.getInputs())
+
     def _compute_node(self, node, out_key, **kwargs):
         # checking if node is already in nodegraph
 
@@ -14,6 +14,7 @@
 # ********************************************************************
 from collections import defaultdict
 
+import bpy
 from nodeitems_utils import NodeCategory, NodeItem
 
 from ...utils import title_str, code_str
@@ -25,6 +26,19 @@ class MxNodeCategory(NodeCategory):
         return context.space_data.tree_type == 'hdusd.MxNodeTree'
 
 
+class MxNodeItem(NodeItem):
+    """Node item, which registers family of MxNode class on adding node if needed"""
+
+    @staticmethod
+    def draw(self, layout, context):
+        if bpy.types.Node.bl_rna_get_subclass(self.nodetype):
+            NodeItem.draw(self, layout, context)
+            return
+
+        props = layout.operator("hdusd.mx_add_node", text=self.label)
+        props.type = self.nodetype
+
+
 def get_node_categories():
     from . import mx_node_classes
 
@@ -36,7 +50,7 @@ def get_node_categories():
     for category, category_classes in d.items():
         categories.append(
             MxNodeCategory('HdUSD_MX_NG_' + code_str(category), title_str(category),
-                           items=[NodeItem(MxNode_cls.bl_idname)
+                           items=[MxNodeItem(MxNode_cls.bl_idname, label=MxNode_cls.bl_label)
                                   for MxNode_cls in category_classes]))
 
     categories.append(
@@ -36,7 +36,10 @@ class ObjectProperties(HdUSDProperties):
         if self.material:
             usd_mat = material.sync_update(prim, self.material, None)
 
-        usd_utils.bind_material(prim, usd_mat)
+        if usd_mat:
+            material.bind(prim, self.material, usd_mat)
+        else:
+            usd_utils.bind_material(prim, None)
 
     def poll_material(self, mat):
         return mat.hdusd.mx_node_tree or mat.node_tree
@@ -100,6 +100,46 @@ class ViewportRenderSettings(RenderSettings):
         default="",
         update=data_source_update
     )
+    use_progressive_sync: bpy.props.BoolProperty(
+        name="Progressive Sync",
+        description="Sync scene objects by batches during viewport redraws instead of blocking UI "
+                    "until whole scene is synced. Closest and largest objects are synced first",
+        default=False,
+    )
+    progressive_sync_time: bpy.props.FloatProperty(
+        name="Sync Time Slice",
+        description="Time in seconds spent on syncing objects per viewport redraw",
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE',
+        min=0.01, max=1.0,
+        default=0.1,
+    )
+    use_playback_cache: bpy.props.BoolProperty(
+        name="Playback Cache",
+        description="Cache animated transforms and deformed meshes as USD time samples during "
+                    "the first animation playback, next playbacks only change render frame",
+        default=False,
+    )
+    use_adaptive_resolution: bpy.props.BoolProperty(
+        name="Adaptive Resolution",
+        description="Render viewport with reduced resolution while navigating",
+        default=False,
+    )
+    adaptive_resolution_scale: bpy.props.FloatProperty(
+        name="Resolution Scale",
+        description="Scale of render resolution during viewport navigation",
+        subtype='FACTOR',
+        min=0.05, max=1.0,
+        default=0.5,
+    )
+    adaptive_resolution_idle_time: bpy.props.FloatProperty(
+        name="Idle Time",
+        description="Time in seconds after last viewport navigation when full resolution is restored",
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE',
+        min=0.0, max=10.0,
+        default=0.3,
+    )
 
 
 class SceneProperties(HdUSDProperties):
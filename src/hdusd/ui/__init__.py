@@ -51,6 +51,7 @@ from . import (
     usd_list,
     mx_nodes,
     object,
+    profiler,
 )
 
 
@@ -63,6 +64,9 @@ register_classes, unregister_classes = bpy.utils.register_classes_factory([
     render.HDUSD_MT_data_source_viewport,
     render.HDUSD_RENDER_PT_render_settings_final,
     render.HDUSD_RENDER_PT_render_settings_viewport,
+    render.HDUSD_RENDER_PT_progressive_sync_viewport,
+    render.HDUSD_RENDER_PT_playback_cache_viewport,
+    render.HDUSD_RENDER_PT_adaptive_resolution_viewport,
     render.HDUSD_RENDER_PT_help_about,
 
     hdrpr_render.HDUSD_RENDER_PT_hdrpr_settings_final,
@@ -117,6 +121,8 @@ register_classes, unregister_classes = bpy.utils.register_classes_factory([
     usd_list.HDUSD_OP_usd_tree_node_print_root_layer,
     usd_list.HDUSD_UL_usd_list_item,
     usd_list.HDUSD_NODE_PT_usd_list,
+    usd_list.HDUSD_NODE_OP_memo_cache_clear,
+    usd_list.HDUSD_NODE_PT_usd_list_memo_cache,
     usd_list.HDUSD_OP_usd_nodetree_add_basic_nodes,
     usd_list.HDUSD_NODE_PT_usd_nodetree_tools,
     usd_list.HDUSD_NODE_PT_usd_nodetree_dev,
@@ -127,12 +133,18 @@ register_classes, unregister_classes = bpy.utils.register_classes_factory([
     mx_nodes.HDUSD_MX_OP_import_file,
     mx_nodes.HDUSD_MX_OP_export_file,
     mx_nodes.HDUSD_MX_OP_export_console,
+    mx_nodes.HDUSD_MX_OP_add_node,
     mx_nodes.HDUSD_MX_OP_create_basic_nodes,
     mx_nodes.HDUSD_MX_MATERIAL_PT_tools,
     mx_nodes.HDUSD_MX_MATERIAL_PT_dev,
 
     object.HDUSD_OBJECT_PT_usd_settings,
     object.HDUSD_OP_usd_object_show_hide,
+
+    profiler.HDUSD_NODE_OP_profiler_enable,
+    profiler.HDUSD_NODE_OP_profiler_clear,
+    profiler.HDUSD_NODE_OP_profiler_export,
+    profiler.HDUSD_NODE_PT_profiler,
 ])
 
 
@@ -260,6 +260,9 @@ class HDUSD_MATERIAL_OP_link_mx_node(bpy.types.Operator):
             else:
                 return {"FINISHED"}
 
+        from ..mx_nodes.nodes import ensure_mx_node_registered
+        ensure_mx_node_registered(self.new_node_name)
+
         new_node = node_tree.nodes.new(self.new_node_name)
         new_node.location = (current_node.location[0] - NODE_LAYER_SEPARATION_WIDTH,
                             current_node.location[1])
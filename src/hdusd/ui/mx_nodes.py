@@ -147,6 +147,21 @@ class HDUSD_MX_OP_export_file(HdUSD_Operator, ExportHelper):
         return bool(context.space_data.edit_tree.output_node)
 
 
+class HDUSD_MX_OP_add_node(bpy.types.Operator):
+    """Add MaterialX node"""
+    bl_idname = "hdusd.mx_add_node"
+    bl_label = "Add Node"
+    bl_options = {'INTERNAL'}
+
+    type: bpy.props.StringProperty()
+
+    def invoke(self, context, event):
+        from ..mx_nodes.nodes import ensure_mx_node_registered
+        ensure_mx_node_registered(self.type)
+
+        return bpy.ops.node.add_node('INVOKE_DEFAULT', type=self.type, use_transform=True)
+
+
 class HDUSD_MX_OP_export_console(HdUSD_Operator):
     bl_idname = "hdusd.mx_export_console"
     bl_label = "Export MaterialX to Console"
@@ -0,0 +1,132 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+import bpy
+from bpy_extras.io_utils import ExportHelper
+
+from . import HdUSD_Panel
+from ..mx_nodes.node_tree import MxNodeTree
+from ..utils.profiler import profiler
+
+
+# maximum number of nodes shown in profiler panel
+MAX_SHOWN_NODES = 20
+
+
+class HDUSD_NODE_OP_profiler_enable(bpy.types.Operator):
+    """Start or stop profiling of node computations"""
+    bl_idname = "hdusd.node_profiler_enable"
+    bl_label = "Profile Nodes"
+
+    enable: bpy.props.BoolProperty(default=True)
+
+    def execute(self, context):
+        if self.enable:
+            profiler.enable()
+        else:
+            profiler.disable()
+
+        return {'FINISHED'}
+
+
+class HDUSD_NODE_OP_profiler_clear(bpy.types.Operator):
+    """Clear collected profiling data"""
+    bl_idname = "hdusd.node_profiler_clear"
+    bl_label = "Clear"
+
+    def execute(self, context):
+        profiler.clear()
+        return {'FINISHED'}
+
+
+class HDUSD_NODE_OP_profiler_export(bpy.types.Operator, ExportHelper):
+    """Export collected profiling data to file"""
+    bl_idname = "hdusd.node_profiler_export"
+    bl_label = "Export Profile"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'}, )
+
+    export_format: bpy.props.EnumProperty(
+        name="Format",
+        items=(('STATS', "Node Stats", "Accumulated stats of each node in JSON format"),
+               ('TRACE', "Chrome Trace", "Compute events for chrome://tracing or Perfetto")),
+        default='STATS',
+    )
+
+    def execute(self, context):
+        if self.export_format == 'TRACE':
+            profiler.export_chrome_trace(self.filepath)
+        else:
+            profiler.export_json(self.filepath)
+
+        return {'FINISHED'}
+
+
+class HDUSD_NODE_PT_profiler(HdUSD_Panel):
+    bl_label = "Profiler"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Tool"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        tree = context.space_data.edit_tree
+        return super().poll(context) and tree and \
+            tree.bl_idname in ("hdusd.USDTree", MxNodeTree.bl_idname)
+
+    def draw(self, context):
+        layout = self.layout
+        tree = context.space_data.edit_tree
+
+        row = layout.row(align=True)
+        if profiler.is_enabled:
+            row.operator(HDUSD_NODE_OP_profiler_enable.bl_idname, text="Stop",
+                         icon='PAUSE').enable = False
+        else:
+            row.operator(HDUSD_NODE_OP_profiler_enable.bl_idname, text="Start",
+                         icon='PLAY').enable = True
+
+        row.operator(HDUSD_NODE_OP_profiler_clear.bl_idname, icon='TRASH')
+        row.operator(HDUSD_NODE_OP_profiler_export.bl_idname, icon='EXPORT', text="")
+
+        stats = profiler.get_stats(tree.name)
+        if not stats:
+            layout.label(text="No computed nodes")
+            return
+
+        active_node = context.active_node
+        col = layout.column(align=True)
+        row = col.row()
+        row.label(text="Node")
+        row.label(text="Calls")
+        row.label(text="Self, ms")
+        row.label(text="Total, ms")
+        if tree.bl_idname == "hdusd.USDTree":
+            row.label(text="Prims")
+
+        for s in stats[:MAX_SHOWN_NODES]:
+            row = col.row()
+            row.label(text=s.node_name,
+                      icon='LAYER_ACTIVE' if active_node and active_node.name == s.node_name
+                      else 'NONE')
+            row.label(text=str(s.calls))
+            row.label(text=f"{s.self_time * 1000:.1f}")
+            row.label(text=f"{s.total_time * 1000:.1f}")
+            if tree.bl_idname == "hdusd.USDTree":
+                row.label(text=str(s.prims))
+
+        if len(stats) > MAX_SHOWN_NODES:
+            col.label(text=f"... {len(stats) - MAX_SHOWN_NODES} more nodes")
@@ -198,6 +198,70 @@ class HDUSD_RENDER_PT_render_settings_viewport(RenderSettingsPanel):
     engine_type = 'VIEWPORT'
 
 
+class HDUSD_RENDER_PT_progressive_sync_viewport(HdUSD_Panel):
+    bl_label = ""
+    bl_parent_id = 'HDUSD_RENDER_PT_render_settings_viewport'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return super().poll(context) and not context.scene.hdusd.viewport.data_source
+
+    def draw_header(self, context):
+        settings = context.scene.hdusd.viewport
+        self.layout.prop(settings, "use_progressive_sync")
+
+    def draw(self, context):
+        settings = context.scene.hdusd.viewport
+
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.enabled = settings.use_progressive_sync
+        layout.prop(settings, "progressive_sync_time")
+
+
+class HDUSD_RENDER_PT_playback_cache_viewport(HdUSD_Panel):
+    bl_label = "Playback Cache"
+    bl_parent_id = 'HDUSD_RENDER_PT_render_settings_viewport'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return super().poll(context) and not context.scene.hdusd.viewport.data_source
+
+    def draw(self, context):
+        settings = context.scene.hdusd.viewport
+
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.prop(settings, "use_playback_cache", text="Cache Animation")
+
+
+class HDUSD_RENDER_PT_adaptive_resolution_viewport(HdUSD_Panel):
+    bl_label = ""
+    bl_parent_id = 'HDUSD_RENDER_PT_render_settings_viewport'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        settings = context.scene.hdusd.viewport
+        self.layout.prop(settings, "use_adaptive_resolution")
+
+    def draw(self, context):
+        settings = context.scene.hdusd.viewport
+
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        layout.enabled = settings.use_adaptive_resolution
+        layout.prop(settings, "adaptive_resolution_scale")
+        layout.prop(settings, "adaptive_resolution_idle_time")
+
+
 class HDUSD_RENDER_PT_help_about(HdUSD_Panel):
     """Help & About USD Hydra addon"""
 
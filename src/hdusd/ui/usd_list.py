@@ -12,25 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #********************************************************************
-import traceback
 from pathlib import Path
 
 import bpy
-import MaterialX as mx
 
-from pxr import UsdGeom, Usd, Sdf, UsdShade
+from pxr import UsdGeom, UsdShade
 from bpy_extras.io_utils import ExportHelper
 
 from . import HdUSD_Panel, HdUSD_ChildPanel, HdUSD_Operator
 from ..usd_nodes.nodes.base_node import USDNode
-from ..mx_nodes.node_tree import MxNodeTree
+from ..usd_nodes import evaluator
+from ..usd_nodes.memo import memo_cache
 from ..engine.viewport_engine import ViewportEngineNodetree
 
 from .. import config
-from ..utils import get_temp_file, temp_pid_dir
-from ..utils import mx as mx_utils
+from ..utils import temp_pid_dir
 from ..export import material
 from ..utils import usd as usd_utils
+from ..utils import usd_package
 
 from ..utils import logging
 log = logging.Log('ui.usd_list')
@@ -212,6 +211,40 @@ class HDUSD_NODE_PT_usd_list(HdUSD_Panel):
                 col.label(text=bind_path)
 
 
+class HDUSD_NODE_OP_memo_cache_clear(bpy.types.Operator):
+    """Clear memo cache of computed USD node stages"""
+    bl_idname = "hdusd.usd_nodes_memo_cache_clear"
+    bl_label = "Clear Memo Cache"
+
+    def execute(self, context):
+        memo_cache.clear()
+        return {'FINISHED'}
+
+
+class HDUSD_NODE_PT_usd_list_memo_cache(HdUSD_ChildPanel):
+    bl_label = "Memo Cache"
+    bl_parent_id = 'HDUSD_NODE_PT_usd_list'
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        node = context.active_node
+
+        col = layout.column(align=True)
+        if not node.use_memo or node.is_bpy_bound:
+            col.label(text="Node isn't memoized")
+
+        col.label(text=f"Hits: {memo_cache.hits}")
+        col.label(text=f"Misses: {memo_cache.misses}")
+        col.label(text=f"Stages: {len(memo_cache.entries)}")
+        col.label(text=f"Memory: {memo_cache.size / 1024 / 1024:.1f} / "
+                       f"{memo_cache.max_size / 1024 / 1024:.0f} MB")
+
+        layout.operator(HDUSD_NODE_OP_memo_cache_clear.bl_idname, icon='TRASH')
+
+
 class HDUSD_NODE_MT_material_select(bpy.types.Menu):
     bl_idname = "HDUSD_NODE_MT_material_select"
     bl_label = "Material"
@@ -247,7 +280,10 @@ class HDUSD_NODE_OP_material_select(bpy.types.Operator):
         if mat:
             usd_mat = material.sync_update(prim, mat, None)
 
-        usd_utils.bind_material(prim, usd_mat)
+        if usd_mat:
+            material.bind(prim, mat, usd_mat)
+        else:
+            usd_utils.bind_material(prim, None)
 
         ViewportEngineNodetree.tag_redraw()
         return {"FINISHED"}
@@ -427,136 +463,9 @@ class HDUSD_NODE_OP_export_usd_file(HdUSD_Operator, ExportHelper):
 
         self.check(context)
 
-        new_stage = Usd.Stage.CreateNew(str(get_temp_file(".usdc")))
-
-        root_layer = new_stage.GetRootLayer()
-        root_layer.TransferContent(input_stage.GetRootLayer())
-
-        dest_path_root_dir = Path(self.filepath).parent
-
-        temp_dir = temp_pid_dir()
-
-        # we need to store all absolute paths and their relative destinations to change absolute references to relative ones
-        paths_dict = {}
-
-        def _update_layer_refs(layer, root_path=[]):
-            for ref in layer.GetCompositionAssetDependencies():
-                ref_path = Path(ref)
-                ref_name = ref_path.name
-                if ref_path.suffix == ".mtlx":
-                    doc = mx.createDocument()
-                    source_path = Path(f"{new_stage.GetPathResolverContext().Get()[0].GetSearchPath()[0]}/{ref}")
-                    dest_path = f"{dest_path_root_dir}/{ref_name}"
-                    search_path = mx.FileSearchPath(str(source_path.parent))
-                    search_path.append(str(mx_utils.MX_LIBS_DIR))
-                    mx.readFromXmlFile(doc, str(source_path), searchPath=search_path)
-
-                    mx_node_tree = next((mat.hdusd.mx_node_tree for mat in bpy.data.materials
-                                         if mat.hdusd.mx_node_tree
-                                         and source_path.stem.startswith(mat.name_full)
-                                         and source_path.stem.endswith(mat.hdusd.mx_node_tree.name_full)), None)
-
-                    if not mx_node_tree:
-                        mat = bpy.data.materials.get(source_path.stem, None)
-                        if not mat:
-                            continue
-
-                        mx_node_tree = bpy.data.node_groups.new(f"MX_{mat.name}", type=MxNodeTree.bl_idname)
-
-                        mat.hdusd.mx_node_tree = mx_node_tree
-
-                        try:
-                            mx_node_tree.import_(doc, source_path)
-                        except Exception as e:
-                            log.error(traceback.format_exc(), source_path)
-                            bpy.data.node_groups.remove(mx_node_tree)
-                            continue
-
-                        # after mx_node_tree.import_ reference updated, so we need to change them back
-                        # since we convert material only to get mx_node_tree
-                        layer.UpdateCompositionAssetDependency(f"./{mat.name}{mat.hdusd.mx_node_tree.name}.mtlx", ref)
-
-                        mx_utils.export_mx_to_file(
-                            doc, dest_path,
-                            is_export_textures=True,
-                            is_export_deps=True,
-                            mx_node_tree=mx_node_tree,
-                            is_clean_texture_folder=False,
-                            is_clean_deps_folders=False)
-
-                        bpy.data.node_groups.remove(mx_node_tree)
-                        continue
-
-                    mx_utils.export_mx_to_file(
-                        doc, dest_path,
-                        is_export_textures=True,
-                        is_export_deps=True,
-                        mx_node_tree=mx_node_tree,
-                        is_clean_texture_folder=False,
-                        is_clean_deps_folders=False)
-
-                else:
-                    ref_layer_path = str(ref_path if ref_path.is_absolute()
-                                         else Path(layer.realPath).parent.joinpath(ref_path))
-
-                    ref_layer = Sdf.Layer.Find(ref_layer_path)
-
-                    if not temp_dir in Path(ref_layer_path).parents:
-                        # if reference is absolute, then we need to add its parent dir name, otherwise we add relative path
-                        if ref_path.is_absolute():
-                            val = Path(ref_layer_path).parent.name
-                        else:
-                            val = str(ref_path.parent)
-
-                        root_path.append(val)
-
-                    if ref_layer.GetCompositionAssetDependencies():
-                        _update_layer_refs(ref_layer, root_path)
-
-                    # if reference is not absolute, we need to build path from our list to get full path from root to curr layer
-                    if temp_dir in Path(ref_layer_path).parents:
-                        dest_path = Path(f"{dest_path_root_dir}/{ref_name}")
-                    else:
-                        dest_path = dest_path_root_dir / "\\".join(root_path) / ref_name
-
-                    ref_layer.Export(str(dest_path))
-
-                    rel_dest_path = dest_path.relative_to(dest_path_root_dir)
-
-                    if ref_path.is_absolute():
-                        paths_dict[ref_path] = rel_dest_path
-
-                    # after we export reference, we need to open it from destination
-                    # to edit its own absolute references to make them relative
-                    exported_ref_stage = Usd.Stage.Open(str(dest_path))
-                    exported_ref_stage_root_layer = exported_ref_stage.GetRootLayer()
-                    for source_ref in exported_ref_stage_root_layer.GetCompositionAssetDependencies():
-                        source_ref_path = Path(source_ref)
-
-                        if source_ref_path.is_absolute():
-                            exported_ref_stage_root_layer.UpdateCompositionAssetDependency(source_ref, str(paths_dict[source_ref_path]))
-                            exported_ref_stage_root_layer.Save()
-
-                    log(f"Export file {ref} to {dest_path}: completed successfuly")
-
-                    # removing path to the current layer before we append new path for the next layer
-                    if len(root_path):
-                        root_path.pop()
-
-            # it is the last layer - root exported layer
-            if layer is root_layer:
-                dest_path = f"{dest_path_root_dir}/{Path(self.filepath).name}"
-                # editing its absolute references to make them relative
-                for source_ref in layer.GetCompositionAssetDependencies():
-                    source_ref_path = Path(source_ref)
-
-                    if source_ref_path.is_absolute():
-                        layer.UpdateCompositionAssetDependency(source_ref, str(paths_dict[source_ref_path]))
-
-                layer.Export(dest_path)
-                log(f"Export file {layer.realPath} to {dest_path}: completed successfuly")
-
-        _update_layer_refs(root_layer)
+        root_layer = input_stage.GetRootLayer()
+        source_dir = Path(root_layer.realPath).parent if root_layer.realPath else temp_pid_dir()
+        usd_package.export_package(root_layer, self.filepath, source_dir)
 
         log.info(f"Export of USD node tree {node_tree.name_full} finished")
 
@@ -600,3 +509,10 @@ class HDUSD_NODE_PT_usd_nodetree_dev(HdUSD_ChildPanel):
 
         layout.operator(HDUSD_OP_usd_tree_node_print_stage.bl_idname)
         layout.operator(HDUSD_OP_usd_tree_node_print_root_layer.bl_idname)
+
+        counters = evaluator.evaluation_counters.get(context.space_data.edit_tree.name)
+        if counters:
+            col = layout.column(align=True)
+            col.label(text="Last evaluation computes:")
+            for node_name, count in counters.items():
+                col.label(text=f"{node_name}: {count}")
@@ -19,6 +19,9 @@ import bpy
 
 from . import node_tree
 from . import nodes
+from . import memo
+from . import opened_stages
+from ..utils.profiler import profiler
 
 
 register_trees, unregister_trees = bpy.utils.register_classes_factory([
@@ -30,8 +33,16 @@ register_trees, unregister_trees = bpy.utils.register_classes_factory([
 def register():
     register_trees()
     nodes.register()
+    bpy.app.timers.register(opened_stages.watch_files,
+                            first_interval=opened_stages.WATCH_INTERVAL, persistent=True)
 
 
 def unregister():
     unregister_trees()
     nodes.unregister()
+    if bpy.app.timers.is_registered(opened_stages.watch_files):
+        bpy.app.timers.unregister(opened_stages.watch_files)
+
+    opened_stages.clear()
+    memo.memo_cache.clear()
+    profiler.disable()
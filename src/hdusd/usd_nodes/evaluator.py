@@ -0,0 +1,227 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+from collections import Counter
+from concurrent import futures
+import time
+
+import bpy
+
+from .. import config
+from ..utils import pass_node_reroute
+from ..utils.stage_cache import CachedStage
+from ..utils.profiler import profiler
+
+from . import log
+
+
+# computes stages of independent nodes, see Evaluator.evaluate_level()
+_executor = futures.ThreadPoolExecutor(thread_name_prefix="hdusd_evaluator")
+
+# Compute counters of the last evaluation of each USD nodetree: {nodetree name: {node name: count}}
+evaluation_counters = {}
+
+
+def _compute_task(task):
+    """Computes stage of node task in worker thread, returns (stage, start time, duration)"""
+    _, _, data, cached_stage, compute_data = task
+    start = time.perf_counter()
+    stage = compute_data(data, cached_stage)
+    return stage, start, time.perf_counter() - start
+
+
+def is_compute_node(node):
+    return not isinstance(node, (bpy.types.NodeReroute, bpy.types.NodeFrame))
+
+
+class Evaluator:
+    """
+    Recomputes dirty nodes of USDTree after a change.
+    Dependency graph of dirty nodes is built once per evaluation and each node is computed
+    at most once in topological order, even through diamond-shaped graphs.
+    Independent nodes which don't access Blender data are computed in thread pool,
+    see USDNode.compute_data().
+    """
+
+    def __init__(self, nodetree):
+        self.nodetree = nodetree
+
+        # names of nodes computed during this evaluation
+        self.computed = set()
+        self.counters = Counter()
+
+    @staticmethod
+    def get_next_nodes(node):
+        """Yields nodes linked to outputs of node, reroute nodes are passed through"""
+        for output in node.outputs:
+            for link in output.links:
+                if not link.is_valid:
+                    continue
+
+                if isinstance(link.to_node, bpy.types.NodeReroute):
+                    yield from Evaluator.get_next_nodes(link.to_node)
+                else:
+                    yield link.to_node
+
+    @staticmethod
+    def get_prev_nodes(node):
+        """Yields nodes linked to inputs of node, reroute nodes are passed through"""
+        for socket_in in node.inputs:
+            if not socket_in.is_linked or not socket_in.links:
+                continue
+
+            link = pass_node_reroute(socket_in.links[0])
+            if link:
+                yield link.from_node
+
+    @staticmethod
+    def get_downstream_nodes(nodes):
+        """Returns all nodes which depend on nodes"""
+        downstream_nodes = {}
+        nodes_to_check = list(nodes)
+        while nodes_to_check:
+            node = nodes_to_check.pop()
+            for next_node in Evaluator.get_next_nodes(node):
+                if next_node.name not in downstream_nodes:
+                    downstream_nodes[next_node.name] = next_node
+                    nodes_to_check.append(next_node)
+
+        return list(downstream_nodes.values())
+
+    def sort(self, nodes):
+        """Returns nodes in topological order: each node goes after nodes it depends on"""
+        node_names = {node.name for node in nodes}
+        visited = set()
+        sorted_nodes = []
+
+        def visit(node):
+            if node.name in visited:
+                return
+
+            visited.add(node.name)
+            for prev_node in self.get_prev_nodes(node):
+                if prev_node.name in node_names:
+                    visit(prev_node)
+
+            sorted_nodes.append(node)
+
+        for node in nodes:
+            visit(node)
+
+        return sorted_nodes
+
+    def is_computed(self, node):
+        return node.name in self.computed
+
+    def node_computed(self, node):
+        self.computed.add(node.name)
+        self.counters[node.name] += 1
+
+    def get_unused_nodes(self, nodes):
+        """
+        Returns names of nodes whose stages aren't required by next nodes,
+        e.g. all next nodes read their stage from cache. Such nodes are computed on demand.
+        """
+        unused_nodes = set()
+        for node in reversed(nodes):
+            next_nodes = tuple(self.get_next_nodes(node))
+            if next_nodes and all(next_node.name in unused_nodes or not next_node.use_inputs()
+                                  for next_node in next_nodes):
+                unused_nodes.add(node.name)
+
+        return unused_nodes
+
+    def get_levels(self, nodes):
+        """
+        Splits sorted nodes to dependency levels: nodes of one level don't depend on each other
+        and depend only on nodes of previous levels
+        """
+        node_levels = {}
+        levels = []
+        for node in nodes:
+            level = max((node_levels[prev_node.name] + 1 for prev_node in self.get_prev_nodes(node)
+                         if prev_node.name in node_levels), default=0)
+            node_levels[node.name] = level
+            if level == len(levels):
+                levels.append([])
+
+            levels[level].append(node)
+
+        return levels
+
+    def evaluate_level(self, nodes):
+        """
+        Computes nodes of one dependency level. Memo keys, input stages and other Blender data
+        are gathered in main thread, then stages of nodes are computed in thread pool and
+        stored to nodes in main thread after all of them are computed.
+        """
+        tasks = []      # [(node, memo key, data, CachedStage, bound compute_data)]
+        for node in nodes:
+            if not node.is_async or node.cached_stage() or self.is_computed(node):
+                node.final_compute(evaluator=self)
+                continue
+
+            log("compute", node)
+            memo_key = node.get_memo_key(evaluator=self) if node.use_memo else None
+            stage = node.restore_memo_stage(memo_key)
+            data = None if stage else node.get_compute_data(evaluator=self)
+            if data is None:
+                node.store_computed_stage(stage, self)
+                continue
+
+            # method is bound in main thread, worker thread doesn't access node
+            tasks.append((node, memo_key, data, CachedStage(), node.compute_data))
+
+        if len(tasks) > 1:
+            results = list(_executor.map(_compute_task, tasks))
+        else:
+            results = [_compute_task(task) for task in tasks]
+
+        for task, (stage, start, duration) in zip(tasks, results):
+            node, memo_key, data, cached_stage, _ = task
+            node.cached_stage.transfer(cached_stage)
+            node.data_computed(data)
+            node.put_memo_stage(memo_key, stage)
+            node.store_computed_stage(stage, self)
+
+            if profiler.is_enabled:
+                # input stages are computed before, therefore all time is self time of node
+                profiler.record(node, start, duration, duration, stage)
+
+    def evaluate(self, nodes):
+        """Frees and recomputes dirty nodes"""
+        nodes = self.sort(tuple(node for node in nodes if is_compute_node(node)))
+        if not nodes:
+            return
+
+        for node in nodes:
+            node.free()
+
+        unused_nodes = self.get_unused_nodes(nodes)
+        if unused_nodes:
+            log("Skipping unused nodes", self.nodetree, unused_nodes)
+            nodes = [node for node in nodes if node.name not in unused_nodes]
+
+        for level_nodes in self.get_levels(nodes):
+            self.evaluate_level(level_nodes)
+
+        log("evaluate", self.nodetree, dict(self.counters))
+        evaluation_counters[self.nodetree.name] = dict(self.counters)
+
+        recomputed = [name for name, count in self.counters.items() if count > 1]
+        if recomputed:
+            if config.usd_nodes_strict_evaluation:
+                raise RuntimeError("Nodes were computed more than once", self.nodetree, recomputed)
+
+            log.warn("Nodes were computed more than once", self.nodetree, recomputed)
@@ -0,0 +1,142 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+from collections import OrderedDict
+import hashlib
+import os
+
+from pxr import Sdf, UsdUtils
+
+from .. import config
+from ..utils.usd_package import file_hash
+
+from . import log
+
+
+# estimated memory size of one Sdf spec in bytes
+SPEC_SIZE = 512
+
+# versions of stages changed in place: {root layer identifier: version}
+_stage_versions = {}
+
+
+def stage_key(stage):
+    """Returns identity of the stage which is changed after in place stage editing"""
+    identifier = stage.GetRootLayer().identifier
+    return identifier, _stage_versions.get(identifier, 0)
+
+
+def stage_changed(stage):
+    """Should be called when stage was changed in place, without recomputing"""
+    identifier = stage.GetRootLayer().identifier
+    _stage_versions[identifier] = _stage_versions.get(identifier, 0) + 1
+
+
+def layer_content_hash(layer):
+    """
+    Returns hash of layer content, where asset paths are replaced by hashes of referenced
+    files and not saved layers. Unlike stage_key() it is the same for equal stages
+    computed in different sessions.
+    """
+    content_layer = Sdf.Layer.CreateAnonymous(".usda")
+    content_layer.TransferContent(layer)
+
+    def asset_hash(asset_path):
+        file_path = layer.ComputeAbsolutePath(asset_path)
+        ref_layer = Sdf.Layer.Find(file_path)
+        if ref_layer and (ref_layer.anonymous or ref_layer.dirty) and \
+                not file_path.endswith(".mtlx"):
+            # MaterialX files are always written to disk, see export.material.write_mx_file()
+            return layer_content_hash(ref_layer)
+
+        if os.path.isfile(file_path):
+            return file_hash(file_path)
+
+        return asset_path
+
+    UsdUtils.ModifyAssetPaths(content_layer, asset_hash)
+    return hashlib.sha1(content_layer.ExportToString().encode()).hexdigest()
+
+
+def get_stage_size(stage):
+    """Estimates memory size of stage by number of specs in its root layer"""
+    specs_count = 0
+
+    def count_spec(path):
+        nonlocal specs_count
+        specs_count += 1
+
+    stage.GetRootLayer().Traverse(Sdf.Path.absoluteRootPath, count_spec)
+    return specs_count * SPEC_SIZE
+
+
+class MemoCache:
+    """
+    LRU cache of computed USD node stages. Key is built from node type, node property values
+    and identities of input stages, therefore stage could be reused after node reset.
+    """
+
+    def __init__(self):
+        # {key: (stage, size)}
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        return config.usd_nodes_memo_size * 1024 * 1024
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if not entry:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, stage):
+        size = get_stage_size(stage)
+        if size > self.max_size:
+            return
+
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+
+        self.entries[key] = (stage, size)
+        self.size += size
+
+        while self.size > self.max_size:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+        log("memo put", key, size, self.size)
+
+    def discard(self, stage):
+        """Removes entries of stage, should be called when stage was changed in place"""
+        for key, (entry_stage, size) in tuple(self.entries.items()):
+            if entry_stage == stage:
+                del self.entries[key]
+                self.size -= size
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+memo_cache = MemoCache()
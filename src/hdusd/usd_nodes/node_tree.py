@@ -17,6 +17,7 @@ import bpy
 from .nodes.hydra_render import HydraRenderNode
 from .nodes.print_file import PrintFileNode
 from .nodes.write_file import WriteFileNode
+from .evaluator import Evaluator, is_compute_node
 from ..viewport import usd_collection
 from ..engine.viewport_engine import ViewportEngineNodetree
 
@@ -56,18 +57,15 @@ class USDTree(bpy.types.ShaderNodeTree):
 
         return secondary_output_node
 
-    def _reset_nodes(self, nodes, is_hard):
+    def reset_nodes(self, nodes, is_hard):
+        """Recomputes nodes and nodes depending on them through Evaluator"""
         self._is_resetting = True
 
         try:
-            nodes = tuple(node for node in nodes if not isinstance(node, (bpy.types.NodeReroute, bpy.types.NodeFrame))
+            nodes = tuple(node for node in nodes if is_compute_node(node)
                           and (is_hard or node.use_hard_reset))
 
-            for node in nodes:
-                node.free()
-
-            for node in nodes:
-                node.final_compute()
+            Evaluator(self).evaluate(nodes)
 
         finally:
             self._is_resetting = False
@@ -77,17 +75,17 @@ class USDTree(bpy.types.ShaderNodeTree):
         if not self._do_update:
             return
 
-        self._reset_nodes(self.nodes, False)
+        self.reset_nodes(self.nodes, False)
 
     def reset(self):
-        self._reset_nodes(self.nodes, True)
+        self.reset_nodes(self.nodes, True)
 
     def depsgraph_update(self, depsgraph):
         if self._is_resetting:
             return
 
         for node in self.nodes:
-            if not isinstance(node, (bpy.types.NodeReroute, bpy.types.NodeFrame)):
+            if is_compute_node(node):
                 node.depsgraph_update(depsgraph)
 
     def frame_change(self, depsgraph):
@@ -95,7 +93,7 @@ class USDTree(bpy.types.ShaderNodeTree):
             return
 
         for node in self.nodes:
-            if not isinstance(node, (bpy.types.NodeReroute, bpy.types.NodeFrame)):
+            if is_compute_node(node):
                 node.frame_change(depsgraph)
 
     def material_update(self, depsgraph):
@@ -103,7 +101,7 @@ class USDTree(bpy.types.ShaderNodeTree):
             return
 
         for node in self.nodes:
-            if not isinstance(node, (bpy.types.NodeReroute, bpy.types.NodeFrame)):
+            if is_compute_node(node):
                 node.material_update(depsgraph)
 
     def no_update_call(self, op, *args, **kwargs):
@@ -20,7 +20,7 @@ from .. import log
 # classes to register
 from . import (
     usd_file, blender_data, write_file, merge, print_file, filter, root, instancing, usd_to_blender,
-    hydra_render, rpr_render_settings, transformations
+    hydra_render, rpr_render_settings, transformations, cache
 )
 
 
@@ -45,6 +45,7 @@ node_categories = [
         NodeItem('usd.FilterNode'),
         NodeItem('usd.RootNode'),
         NodeItem('usd.InstancingNode'),
+        NodeItem('usd.CacheNode'),
     ]),
     USDNodeCategory('HdUSD_USD_TRANSFORMATIONS', 'Transformations', items=[
         NodeItem('usd.TransformNode'),
@@ -68,6 +69,7 @@ register_classes, unregister_classes = bpy.utils.register_classes_factory([
     instancing.HDUSD_USD_NODETREE_MT_instancing_object,
 
     usd_file.UsdFileNode,
+    write_file.HDUSD_USD_NODETREE_OP_write_file,
     write_file.WriteFileNode,
     merge.MergeNode,
     # print_file.PrintFileNode,
@@ -80,6 +82,8 @@ register_classes, unregister_classes = bpy.utils.register_classes_factory([
     transformations.HDUSD_USD_NODETREE_OP_transform_add_empty,
     transformations.TransformNode,
     transformations.TransformByEmptyNode,
+    cache.HDUSD_USD_NODETREE_OP_cache_update,
+    cache.CacheNode,
 ])
 
 
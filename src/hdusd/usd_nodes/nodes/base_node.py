@@ -16,6 +16,8 @@ import bpy
 from pxr import Usd
 
 from ...utils import pass_node_reroute
+from ..evaluator import Evaluator
+from ..memo import memo_cache, stage_key, stage_changed, layer_content_hash
 
 from . import log
 
@@ -29,6 +31,22 @@ class USDNode(bpy.types.Node):
     output_name = "Output"
     use_hard_reset = True
 
+    # bpy bound nodes access Blender data in compute(), their stages aren't memoized
+    # and they have data version, see data_changed()
+    is_bpy_bound = False
+
+    # computed stages of nodes are stored in memo cache and reused
+    # if node with the same type, properties and input stages is computed again
+    use_memo = True
+
+    # node stage only references or passes through input stages, therefore in place changes
+    # of input stages are delivered through composition and the node isn't recomputed
+    is_reference_only = False
+
+    # stage of reference only node is built from the list of input prims,
+    # therefore it is recomputed when input prims are added or removed
+    depends_on_input_prims = True
+
     @classmethod
     def poll(cls, tree):
         return tree.bl_idname == 'hdusd.USDTree'
@@ -49,24 +67,101 @@ class USDNode(bpy.types.Node):
         """
         Main compute function which should be overridable in child classes.
         It should return Prim object or None.
+        Nodes which implement get_compute_data() and compute_data() don't override it.
+        """
+        data = self.get_compute_data(**kwargs)
+        if data is None:
+            return None
+
+        stage = self.compute_data(data, self.cached_stage)
+        self.data_computed(data)
+        return stage
+
+    def get_compute_data(self, **kwargs):
+        """
+        Returns snapshot of Blender data required by compute_data(): property values,
+        input stages, resolved paths, or None if node has nothing to compute.
+        It is called in main thread, input nodes are computed here.
         """
         return None
 
+    def compute_data(self, data, cached_stage):
+        """
+        Computes stage from data of get_compute_data(), new stage is created in cached_stage.
+        It could be called in worker thread, therefore it must not access Blender data.
+        """
+        raise NotImplementedError
+
+    def data_computed(self, data):
+        """Stores results of compute_data() which are shared between nodes, called in main thread"""
+        pass
+
+    @property
+    def is_async(self):
+        """Node stage could be computed by compute_data() in worker thread"""
+        return not self.is_bpy_bound and type(self).compute_data is not USDNode.compute_data
+
     def final_compute(self, group_nodes=(), **kwargs):
         """
         This is the entry point of node parser system.
         This function does some useful preparation before and after calling compute() function.
         """
         stage = self.cached_stage()
-        if not stage:
-            log("compute", self, group_nodes)
-            stage = self.compute(group_nodes=group_nodes, **kwargs)
-            self.cached_stage.assign(stage)
-            self.hdusd.usd_list.update_items()
-            self.node_computed()
+        if stage:
+            return stage
+
+        evaluator = kwargs.get('evaluator')
+        if evaluator and evaluator.is_computed(self):
+            # node was already computed during current evaluation and has no stage
+            return None
+
+        log("compute", self, group_nodes)
+        stage = self.compute_stage(group_nodes=group_nodes, **kwargs)
+        self.store_computed_stage(stage, evaluator)
 
         return stage
 
+    def compute_stage(self, **kwargs):
+        """Computes stage or takes it from memo cache if node with the same data was computed"""
+        memo_key = self.get_memo_key(**kwargs) if self.use_memo and not self.is_bpy_bound else None
+        stage = self.restore_memo_stage(memo_key)
+        if stage:
+            return stage
+
+        stage = self.compute(**kwargs)
+        self.put_memo_stage(memo_key, stage)
+        return stage
+
+    def restore_memo_stage(self, memo_key):
+        """Returns stage of node with the same data from memo cache, the stage is cached by node"""
+        if not memo_key:
+            return None
+
+        stage = memo_cache.get(memo_key)
+        if stage and self.cached_stage.restore(stage):
+            log("memo hit", self)
+            return stage
+
+        return None
+
+    def put_memo_stage(self, memo_key, stage):
+        # only stages created by the node are stored, passed through input stages are not
+        if memo_key and stage and self.cached_stage.is_owner:
+            memo_cache.put(memo_key, stage)
+
+    def store_computed_stage(self, stage, evaluator=None):
+        """Stores computed stage and notifies evaluator and node about it"""
+        self.cached_stage.assign(stage)
+        if self.is_bpy_bound:
+            # data version corresponds to previous stage
+            self.data_changed()
+
+        self.hdusd.usd_list.update_items()
+        if evaluator:
+            evaluator.node_computed(self)
+
+        self.node_computed()
+
     def _compute_node(self, node, group_node=None, **kwargs):
         """
         Exports node with output socket.
@@ -89,10 +184,71 @@ class USDNode(bpy.types.Node):
         # getting corresponded NodeParser class
         return node.final_compute(group_nodes, **kwargs)
 
+    def use_inputs(self):
+        """Returns False if node computes its stage without input stages"""
+        return True
+
+    def data_changed(self):
+        """
+        Should be called when Blender data used by node was changed. Data version, which is
+        used as a key of persistent cache (see CacheNode), is cleared and computed again
+        from content of node stage when it is required.
+        """
+        self['data_version'] = ""
+
+    def get_data_version(self, do_compute=False):
+        """
+        Returns version of Blender data used by node: hash of content of computed stage,
+        which is saved with the node. Nodes which don't access Blender data have empty version.
+        Returns None if version is unknown and it isn't computed.
+        """
+        if not self.is_bpy_bound:
+            return ""
+
+        version = self.get('data_version', "")
+        if version or not do_compute:
+            return version or None
+
+        stage = self.cached_stage()
+        if not stage:
+            return None
+
+        version = layer_content_hash(stage.GetRootLayer())
+        self['data_version'] = version
+        return version
+
     def node_computed(self):
         """Notifier that stage for this node has been already computed"""
         pass
 
+    def get_memo_properties(self):
+        """Returns values of node properties which affect computed stage"""
+        values = []
+        for prop in self.bl_rna.properties:
+            if prop.identifier in bpy.types.Node.bl_rna.properties or prop.type == 'COLLECTION':
+                continue
+
+            value = getattr(self, prop.identifier)
+            if prop.type == 'POINTER':
+                value = value.name_full if value else None
+            elif isinstance(value, set):
+                value = frozenset(value)
+            elif getattr(prop, 'is_array', False):
+                value = tuple(value)
+
+            values.append((prop.identifier, value))
+
+        return tuple(values)
+
+    def get_memo_key(self, **kwargs):
+        """Returns key of node data in memo cache: node type, properties and input stages"""
+        input_keys = []
+        for i in range(len(self.inputs)):
+            stage = self.get_input_link(i, **kwargs)
+            input_keys.append(stage_key(stage) if stage else None)
+
+        return self.bl_idname, self.get_memo_properties(), tuple(input_keys)
+
     # HELPER FUNCTIONS
     # Child classes should use them to do their compute
 
@@ -124,29 +280,59 @@ class USDNode(bpy.types.Node):
         self.cached_stage.clear()
 
     def reset(self, is_hard=False):
-        if is_hard or self.use_hard_reset:
-            log("reset", self)
+        log("reset", self)
+        self.id_data.reset_nodes((self, *Evaluator.get_downstream_nodes((self,))), is_hard)
+
+    def update_parameters(self):
+        """
+        Applies changed parameter-only properties to already computed stage by set_parameters().
+        Next nodes which only reference this stage aren't recomputed.
+        """
+        stage = self.cached_stage()
+        if not stage or not self.cached_stage.is_owner or not self.set_parameters(stage):
+            self.reset()
+            return
+
+        log("update_parameters", self)
 
-            self.free()
-            self.final_compute()
-            self.hdusd.usd_list.update_items()
+        # memoized stages of this and next nodes don't correspond to their keys anymore
+        memo_cache.discard(stage)
+        stage_changed(stage)
 
-        self._reset_next(is_hard)
+        self._update_next()
+
+    def _update_next(self, is_prims_changed=False):
+        """
+        Resets next nodes after this stage was changed in place, except nodes
+        which only reference the stage and receive changes through composition.
+        """
+        nodetree = self.id_data
+        next_nodes = Evaluator.get_downstream_nodes((self,))
+        nodes = [node for node in next_nodes if not node.is_reference_only or
+                 (is_prims_changed and node.depends_on_input_prims)]
+        reset_nodes = (*nodes, *Evaluator.get_downstream_nodes(nodes))
+        nodetree.reset_nodes(reset_nodes, True)
+
+        # output node notifies about computed stage only when it is recomputed
+        output_node = nodetree.get_output_node()
+        if output_node and output_node.name in (node.name for node in next_nodes) and \
+                output_node.name not in (node.name for node in reset_nodes):
+            nodetree.output_node_computed()
+
+    def set_parameters(self, stage):
+        """
+        Sets parameter-only properties to computed stage.
+        Returns False if stage has to be recomputed.
+        """
+        return False
 
     def _reset_next(self, is_hard):
-        nodes_to_reset = []
-
-        def get_nodes(node):
-            if not isinstance(node, bpy.types.NodeReroute) and node is not self:
-                nodes_to_reset.append(node)
-                return
-            for output in node.outputs:
-                for link in output.links:
-                    if link.is_valid:
-                        get_nodes(link.to_node)
-        get_nodes(self)
-        for node in nodes_to_reset:
-            node.reset(is_hard)
+        stage = self.cached_stage()
+        if stage:
+            # stage was changed in place, therefore memoized stages of next nodes are outdated
+            stage_changed(stage)
+
+        self.id_data.reset_nodes(Evaluator.get_downstream_nodes((self,)), is_hard)
 
     def depsgraph_update(self, depsgraph):
         pass
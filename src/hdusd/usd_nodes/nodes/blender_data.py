@@ -17,6 +17,7 @@ import bpy
 from pxr import UsdGeom
 
 from .base_node import USDNode
+from ..memo import stage_changed
 from ...export import object, material, world
 from ...utils import usd as usd_utils
 from ...export.object import ObjectData, SUPPORTED_TYPES, sdf_name
@@ -108,6 +109,10 @@ class HDUSD_USD_NODETREE_MT_blender_data_object(bpy.types.Menu):
             op.object_name = obj.name
 
 
+# {(nodetree name, node name): set of sdf names of synced objects}
+_object_keys = {}
+
+
 class BlenderDataNode(USDNode):
     """Blender data to USD can export whole scene, one collection or object"""
     bl_idname = 'usd.BlenderDataNode'
@@ -116,6 +121,7 @@ class BlenderDataNode(USDNode):
 
     input_names = ()
     use_hard_reset = False
+    is_bpy_bound = True
 
     def update_data(self, context):
         self.reset(True)
@@ -175,6 +181,23 @@ class BlenderDataNode(USDNode):
                 row.menu(HDUSD_USD_NODETREE_MT_blender_data_object.bl_idname,
                          text=" ", icon='OBJECT_DATAMODE')
 
+    @property
+    def object_keys(self):
+        """Index of sdf names of synced objects, it is kept between depsgraph updates"""
+        key = (self.id_data.name, self.name)
+        keys = _object_keys.get(key)
+        if keys is None:
+            stage = self.cached_stage()
+            keys = set(prim.GetName() for prim in stage.GetPseudoRoot().GetAllChildren()
+                       if prim.GetName() != world.OBJ_PRIM_NAME) if stage else set()
+            _object_keys[key] = keys
+
+        return keys
+
+    def free(self):
+        super().free()
+        _object_keys.pop((self.id_data.name, self.name), None)
+
     def compute(self, **kwargs):
         depsgraph = bpy.context.evaluated_depsgraph_get()
 
@@ -184,10 +207,12 @@ class BlenderDataNode(USDNode):
 
         root_prim = stage.GetPseudoRoot()
         kwargs = {'scene': depsgraph.scene}
+        keys = set()
 
         if self.data == 'SCENE':
             for obj_data in ObjectData.depsgraph_objects(depsgraph):
                 object.sync(root_prim, obj_data, **kwargs)
+                keys.add(obj_data.sdf_name)
 
             if depsgraph.scene.world is not None:
                 world.sync(root_prim, depsgraph.scene.world)
@@ -200,29 +225,53 @@ class BlenderDataNode(USDNode):
                 if obj_col.hdusd.is_usd:
                     continue
 
-                object.sync(root_prim, ObjectData.from_object(
-                    obj_col.evaluated_get(depsgraph)), **kwargs)
+                obj_data = ObjectData.from_object(obj_col.evaluated_get(depsgraph))
+                object.sync(root_prim, obj_data, **kwargs)
+                keys.add(obj_data.sdf_name)
 
         elif self.data == 'OBJECT':
             if not self.object or self.object.hdusd.is_usd:
                 return
 
-            object.sync(root_prim, ObjectData.from_object(self.object.evaluated_get(depsgraph)),
-                        **kwargs)
+            obj_data = ObjectData.from_object(self.object.evaluated_get(depsgraph))
+            object.sync(root_prim, obj_data, **kwargs)
+            keys.add(obj_data.sdf_name)
 
+        _object_keys[(self.id_data.name, self.name)] = keys
         return stage
 
     def depsgraph_update(self, depsgraph):
         stage = self.cached_stage()
         if not stage:
-            self.final_compute()
+            # stage wasn't computed because next nodes didn't require it, if Blender data
+            # was changed next nodes are reset and they compute the stage if it's required now.
+            # Selection changes don't update geometry or transform of objects.
+            if any(isinstance(update.id, (bpy.types.World, bpy.types.Collection)) or
+                   (isinstance(update.id, bpy.types.Object) and
+                    (update.is_updated_geometry or update.is_updated_transform))
+                   for update in depsgraph.updates):
+                self.data_changed()
+                self._reset_next(True)
+
             return
 
         is_updated = False
+        is_prims_changed = False
 
         root_prim = stage.GetPseudoRoot()
         kwargs = {'scene': depsgraph.scene}
 
+        # depsgraph objects are collected once per update and only if they are required
+        depsgraph_objects = None
+
+        def get_depsgraph_objects():
+            nonlocal depsgraph_objects
+            if depsgraph_objects is None:
+                depsgraph_objects = {obj_data.sdf_name: obj_data
+                                     for obj_data in ObjectData.depsgraph_objects(depsgraph)}
+
+            return depsgraph_objects
+
         for update in depsgraph.updates:
             if isinstance(update.id, bpy.types.Scene):
                 scene = update.id
@@ -255,8 +304,9 @@ class BlenderDataNode(USDNode):
                                        update.is_updated_geometry, update.is_updated_transform,
                                        **kwargs)
 
-                for inst_obj_data in ObjectData.depsgraph_objects_inst(depsgraph):
-                    if obj_data.sdf_name == sdf_name(inst_obj_data.object):
+                for inst_obj_data in get_depsgraph_objects().values():
+                    if inst_obj_data.instance_id != 0 and \
+                            obj_data.sdf_name == sdf_name(inst_obj_data.object):
                         object.sync_update(root_prim, inst_obj_data, update.is_updated_geometry, update.is_updated_transform
                                            , **kwargs)
 
@@ -276,13 +326,12 @@ class BlenderDataNode(USDNode):
             if isinstance(update.id, bpy.types.Collection):
                 coll = update.id
 
-                current_keys = set(prim.GetName() for prim in root_prim.GetAllChildren())
+                current_keys = self.object_keys
                 required_keys = set()
-                depsgraph_keys = set(obj_data.sdf_name for obj_data in ObjectData.depsgraph_objects(depsgraph))
-                instances_keys = set(obj_data.sdf_name for obj_data in ObjectData.depsgraph_objects_inst(depsgraph))
+                depsgraph_keys = get_depsgraph_objects().keys()
 
                 if self.data == 'SCENE':
-                    required_keys = depsgraph_keys
+                    required_keys = set(depsgraph_keys)
 
                 elif self.data == 'COLLECTION':
                     if not self.collection:
@@ -291,6 +340,8 @@ class BlenderDataNode(USDNode):
                     if coll.name != self.collection.name:
                         continue
 
+                    instances_keys = set(key for key, obj_data in get_depsgraph_objects().items()
+                                         if obj_data.instance_id != 0)
                     required_keys = set(object.sdf_name(obj) for obj in coll.objects)
                     required_keys.intersection_update(depsgraph_keys)
                     required_keys = required_keys | instances_keys
@@ -305,28 +356,37 @@ class BlenderDataNode(USDNode):
                 keys_to_remove = current_keys - required_keys
                 keys_to_add = required_keys - current_keys
 
-                if keys_to_remove:
-                    for key in keys_to_remove:
-                        if key == world.OBJ_PRIM_NAME:
-                            continue
+                for key in keys_to_remove:
+                    root_prim.GetStage().RemovePrim(root_prim.GetPath().AppendChild(key))
+                    current_keys.discard(key)
+                    is_prims_changed = True
 
-                        root_prim.GetStage().RemovePrim(root_prim.GetPath().AppendChild(key))
-                        is_updated = True
-
-                if keys_to_add:
-                    for obj_data in ObjectData.depsgraph_objects(depsgraph):
-                        if obj_data.sdf_name not in keys_to_add:
-                            continue
-
-                        object.sync(root_prim, obj_data, **kwargs)
-                        is_updated = True
+                for key in keys_to_add:
+                    object.sync(root_prim, get_depsgraph_objects()[key], **kwargs)
+                    current_keys.add(key)
+                    is_prims_changed = True
 
                 continue
 
-        if is_updated:
+        if is_updated or is_prims_changed:
+            self.data_changed()
             self.hdusd.usd_list.update_items()
-            self._reset_next(True)
+
+            # stage was changed in place, only next nodes which depend on it are recomputed
+            stage_changed(stage)
+            self._update_next(is_prims_changed)
 
     def material_update(self, mat):
+        self.data_changed()
+
         stage = self.cached_stage()
+        if not stage:
+            # stage wasn't computed because next nodes didn't require it
+            self._reset_next(True)
+            return
+
         material.sync_update_all(stage.GetPseudoRoot(), mat)
+
+        # stage was changed in place, therefore memoized stages of next nodes are outdated
+        stage_changed(stage)
+        self._update_next()
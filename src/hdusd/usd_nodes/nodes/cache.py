@@ -0,0 +1,235 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+from pathlib import Path
+import hashlib
+import os
+import re
+import shutil
+
+import bpy
+from pxr import Usd, UsdUtils
+
+from .base_node import USDNode
+from .write_file import request_write
+from ..evaluator import Evaluator
+from ... import config
+from ...utils import cache_dir, temp_dir
+from ...utils.usd_package import write_file
+from . import log
+
+
+# cache is written when Blender is idle: after delay since last compute of the node
+WRITE_DELAY = 2.0
+
+CACHE_FILE_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def remove_cache_file(file_path):
+    """Removes cache file with its assets"""
+    try:
+        file_path.unlink()
+
+    except OSError as e:
+        # file could be opened by USD on Windows
+        log.warn("Couldn't remove cache file", file_path, e)
+        return
+
+    shutil.rmtree(file_path.with_suffix(""), ignore_errors=True)
+    log("Cache file removed", file_path)
+
+
+def evict_cache_files(directory, keep_path):
+    """Removes least recently used cache files until their size fits to config.usd_nodes_cache_size"""
+    files = []
+    for file_path in directory.glob("*.usdc"):
+        if not CACHE_FILE_RE.fullmatch(file_path.stem):
+            continue
+
+        stat = file_path.stat()
+        size = stat.st_size
+        assets_dir = file_path.with_suffix("")
+        if assets_dir.is_dir():
+            size += sum(f.stat().st_size for f in assets_dir.iterdir() if f.is_file())
+
+        files.append((stat.st_mtime, size, file_path))
+
+    total_size = sum(size for _, size, _ in files)
+    max_size = config.usd_nodes_cache_size * 1024 * 1024
+    for _, size, file_path in sorted(files):
+        if total_size <= max_size:
+            break
+
+        if file_path != keep_path:
+            remove_cache_file(file_path)
+            total_size -= size
+
+
+def write_cache(layer, file_path, replaced_path):
+    """Writes flattened layer to cache file, removes cache file which it replaces"""
+    # assets from temp dir are copied to cache, temp dir is cleared after reopening .blend
+    assets_dir = file_path.with_suffix("")
+    temp_path = temp_dir()
+
+    def copy_asset(asset_path):
+        path = Path(asset_path)
+        if not path.is_absolute() or temp_path not in path.parents or not path.is_file():
+            return asset_path
+
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copy(path, assets_dir / path.name)
+        return str(assets_dir / path.name)
+
+    try:
+        UsdUtils.ModifyAssetPaths(layer, copy_asset)
+        # file is written to temporary file first, so it isn't read partially written
+        write_file(file_path, layer.Export)
+
+    except Exception as e:
+        log.error("Couldn't write cache file", file_path, e)
+        return f"Error: {e}"
+
+    if replaced_path and replaced_path != file_path and replaced_path.is_file():
+        remove_cache_file(replaced_path)
+
+    evict_cache_files(file_path.parent, file_path)
+
+
+class HDUSD_USD_NODETREE_OP_cache_update(bpy.types.Operator):
+    """Remove cache file and compute input nodes again"""
+    bl_idname = "hdusd.usd_nodetree_cache_update"
+    bl_label = "Update Cache"
+
+    def execute(self, context):
+        node = context.node
+        file_path = node.get_cache_file()
+        if file_path and file_path.is_file():
+            remove_cache_file(file_path)
+
+        node.reset(True)
+        return {"FINISHED"}
+
+
+class CacheNode(USDNode):
+    """
+    Saves input stage to .usdc file in persistent cache dir. The file is keyed by hash of
+    input nodes properties and Blender data versions, while the key matches input nodes
+    aren't computed, even after reopening .blend file. Cache is written when Blender is idle,
+    least recently used files are removed when cache size exceeds config.usd_nodes_cache_size.
+    """
+    bl_idname = 'usd.CacheNode'
+    bl_label = "Cache"
+    bl_icon = "DISK_DRIVE"
+
+    # key of memo cache requires computed input stage
+    use_memo = False
+
+    # cache key reads Blender data
+    is_bpy_bound = True
+
+    def update_data(self, context):
+        self.reset(True)
+
+    directory: bpy.props.StringProperty(
+        name="Directory",
+        description="Directory of cache files, default cache dir is used if empty",
+        subtype='DIR_PATH',
+        update=update_data
+    )
+
+    def draw_buttons(self, context, layout):
+        layout.prop(self, 'directory')
+        layout.operator(HDUSD_USD_NODETREE_OP_cache_update.bl_idname, icon='FILE_REFRESH')
+
+    def get_cache_key(self, do_compute_versions=False):
+        """
+        Returns hash of .blend file, current frame, properties and data versions of all input
+        nodes. Returns None if data version of some input node is unknown.
+        """
+        key = hashlib.sha1()
+        key.update(bpy.data.filepath.encode())
+        key.update(str(bpy.context.scene.frame_current).encode())
+
+        nodes_to_check = [self]
+        while nodes_to_check:
+            node = nodes_to_check.pop()
+            for prev_node in Evaluator.get_prev_nodes(node):
+                version = prev_node.get_data_version(do_compute_versions)
+                if version is None:
+                    return None
+
+                key.update(repr((prev_node.bl_idname, prev_node.get_memo_properties(),
+                                 version)).encode())
+                nodes_to_check.append(prev_node)
+
+        return key.hexdigest()
+
+    def get_cache_file(self, do_compute_versions=False):
+        if not bpy.data.filepath or not self.inputs[0].is_linked:
+            # cache is persistent only for saved .blend file
+            return None
+
+        key = self.get_cache_key(do_compute_versions)
+        if not key:
+            return None
+
+        directory = Path(bpy.path.abspath(self.directory)) if self.directory else cache_dir()
+        return directory / f"{key}.usdc"
+
+    def use_inputs(self):
+        file_path = self.get_cache_file()
+        return not file_path or not file_path.is_file()
+
+    def write(self, delay=WRITE_DELAY):
+        request_write(self, delay)
+
+    def get_write_task(self):
+        stage = self.cached_stage()
+        if not stage:
+            return None
+
+        # data versions of input nodes are computed from their stages
+        file_path = self.get_cache_file(True)
+        if not file_path:
+            return None
+
+        if file_path.is_file():
+            # the same stage is already cached
+            os.utime(file_path)
+            return None
+
+        log("Writing cache", self, file_path)
+        replaced_path = self.get('cache_file', "")
+        self['cache_file'] = str(file_path)
+
+        return write_cache, stage.Flatten(), file_path, \
+            Path(replaced_path) if replaced_path else None
+
+    def compute(self, **kwargs):
+        file_path = self.get_cache_file()
+        if file_path and file_path.is_file():
+            log("Reading cache", self, file_path)
+            # access time of cache file is used for eviction
+            os.utime(file_path)
+            stage = Usd.Stage.Open(str(file_path))
+            self.cached_stage.insert(stage)
+            return stage
+
+        # input stage is passed through and written to cache later,
+        # when its key is computed from content of input stages
+        input_stage = self.get_input_link('Input', **kwargs)
+        if input_stage and bpy.data.filepath:
+            self.write()
+
+        return input_stage
@@ -12,12 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ********************************************************************
-import re
-
 import bpy
 from pxr import Usd, UsdGeom
 
 from .base_node import USDNode
+from .. import prim_matcher
+from ...utils import usd as usd_utils
 
 
 class FilterNode(USDNode):
@@ -26,6 +26,8 @@ class FilterNode(USDNode):
     bl_label = "Filter"
     bl_icon = "FILTER"
 
+    is_reference_only = True
+
     def update_data(self, context):
         self.reset()
 
@@ -41,38 +43,40 @@ class FilterNode(USDNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, 'filter_path')
 
-    def compute(self, **kwargs):
+    def get_compute_data(self, **kwargs):
         input_stage = self.get_input_link('Input', **kwargs)
         if not input_stage:
             return None
 
-        # creating search regex pattern and getting filtered rpims
-        prog = re.compile(self.filter_path.replace('*', '#')        # temporary replacing '*' to '#'
-                                          .replace('/', '\/')       # for correct regex pattern
-                                          .replace('##', '[\w\/]*') # creation
-                                          .replace('#', '\w*'))
-
-        def get_child_prims(prim):
-            if not prim.IsPseudoRoot() and prog.fullmatch(str(prim.GetPath())):
-                yield prim
-                return
+        return {
+            'input_stage': input_stage,
+            'filter_path': self.filter_path,
+            'paths': prim_matcher.get_cached_paths(input_stage, self.filter_path),
+        }
 
-            for child in prim.GetAllChildren():
-                yield from get_child_prims(child)
+    def compute_data(self, data, cached_stage):
+        input_stage = data['input_stage']
+        if data['paths'] is None:
+            matcher = prim_matcher.PrimPathMatcher(data['filter_path'])
+            data['paths'] = matcher.find_paths(input_stage)
 
-        prims = tuple(get_child_prims(input_stage.GetPseudoRoot()))
-        if not prims:
+        paths = data['paths']
+        if not paths:
             return None
 
-        stage = self.cached_stage.create()
+        stage = cached_stage.create()
         UsdGeom.SetStageMetersPerUnit(stage, 1)
         UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
 
-        root_prim = stage.GetPseudoRoot()
-
-        for i, prim in enumerate(prims, 1):
-            override_prim = stage.OverridePrim(root_prim.GetPath().AppendChild(prim.GetName()))
-            override_prim.GetReferences().AddReference(input_stage.GetRootLayer().realPath,
-                                                       prim.GetPath())
+        root_prims = input_stage.GetPseudoRoot().GetAllChildren()
+        if list(paths) == [prim.GetPath() for prim in root_prims]:
+            # all root prims are matched, input stage is composed as sublayer
+            stage.GetRootLayer().subLayerPaths.append(input_stage.GetRootLayer().realPath)
+        else:
+            usd_utils.add_references(stage, stage.GetPseudoRoot().GetPath(), input_stage,
+                                     [input_stage.GetPrimAtPath(path) for path in paths])
 
         return stage
+
+    def data_computed(self, data):
+        prim_matcher.cache_paths(data['input_stage'], data['filter_path'], data['paths'])
@@ -25,6 +25,9 @@ class HydraRenderNode(USDNode):
     bl_icon = "RESTRICT_RENDER_OFF"
 
     output_name = ""
+    use_memo = False
+    is_reference_only = True
+    depends_on_input_prims = False
 
     render_type: bpy.props.EnumProperty(
         name='Type',
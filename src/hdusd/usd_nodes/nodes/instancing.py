@@ -47,6 +47,9 @@ class InstancingNode(USDNode):
     bl_label = "Instancing"
     bl_icon = "STICKY_UVS_DISABLE"
 
+    is_bpy_bound = True
+    is_reference_only = True
+
     def update_data(self, context):
         self.reset(True)
 
@@ -149,4 +152,5 @@ class InstancingNode(USDNode):
         obj = next((update.id for update in depsgraph.updates if isinstance(update.id, bpy.types.Object)
                     and not update.id.hdusd.is_usd and update.id.name == self.object.name), None)
         if obj:
+            self.data_changed()
             self.reset()
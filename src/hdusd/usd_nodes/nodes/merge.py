@@ -28,6 +28,9 @@ class MergeNode(USDNode):
     bl_label = "Merge"
     bl_icon = "SELECT_EXTEND"
 
+    is_reference_only = True
+    depends_on_input_prims = False
+
     input_names = tuple(f"Input {i + 1}" for i in range(MAX_INPUTS_NUMBER))
 
     def update_inputs_number(self, context):
@@ -54,7 +57,7 @@ class MergeNode(USDNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, 'inputs_number')
 
-    def compute(self, **kwargs):
+    def get_compute_data(self, **kwargs):
         ref_stages = []
         for i in range(len(self.inputs)):
             stage = self.get_input_link(i, **kwargs)
@@ -64,18 +67,19 @@ class MergeNode(USDNode):
         if not ref_stages:
             return None
 
+        return {'ref_stages': ref_stages}
+
+    def compute_data(self, data, cached_stage):
+        ref_stages = data['ref_stages']
         if len(ref_stages) == 1:
             return ref_stages[0]
 
-        stage = self.cached_stage.create()
+        stage = cached_stage.create()
         UsdGeom.SetStageMetersPerUnit(stage, 1)
         UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
 
-        root_prim = stage.GetPseudoRoot()
-
-        for ref_stage in ref_stages:
-            for prim in ref_stage.GetPseudoRoot().GetAllChildren():
-                override_prim = stage.OverridePrim(root_prim.GetPath().AppendChild(prim.GetName()))
-                override_prim.GetReferences().AddReference(ref_stage.GetRootLayer().realPath, prim.GetPath())
+        # input stages are composed as sublayers, root prims with the same name are merged
+        stage.GetRootLayer().subLayerPaths = [ref_stage.GetRootLayer().realPath
+                                              for ref_stage in ref_stages]
 
         return stage
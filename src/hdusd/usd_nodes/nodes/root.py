@@ -16,6 +16,7 @@ import bpy
 from pxr import Usd, UsdGeom, UsdSkel, Sdf, Tf
 
 from .base_node import USDNode
+from ...utils import usd as usd_utils
 
 from . import log
 
@@ -26,9 +27,14 @@ class RootNode(USDNode):
     bl_label = "Root"
     bl_icon = "COLLECTION_NEW"
 
+    is_reference_only = True
+
     def update_data(self, context):
         self.reset()
 
+    def update_type(self, context):
+        self.update_parameters()
+
     name: bpy.props.StringProperty(
         name="Name",
         description="Name for USD root primitive",
@@ -43,39 +49,52 @@ class RootNode(USDNode):
                ('SkelRoot', "SkelRoot", "SkelRoot primitive type"),
                ('None', "None", "No primitive type")),
         default='Xform',
-        update=update_data
+        update=update_type
     )
 
     def draw_buttons(self, context, layout):
         layout.prop(self, 'name')
         layout.prop(self, 'type')
 
-    def compute(self, **kwargs):
+    def get_compute_data(self, **kwargs):
         input_stage = self.get_input_link('Input', **kwargs)
-
         if not input_stage:
             return None
 
-        if not self.name:
+        return {'input_stage': input_stage, 'name': self.name, 'type': self.type}
+
+    def compute_data(self, data, cached_stage):
+        input_stage = data['input_stage']
+        if not data['name']:
             return input_stage
 
-        path = f'/{Tf.MakeValidIdentifier(self.name)}'
-        stage = self.cached_stage.create()
+        path = f'/{Tf.MakeValidIdentifier(data["name"])}'
+        stage = cached_stage.create()
         UsdGeom.SetStageMetersPerUnit(stage, 1)
         UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
 
         # create new root prim according to name and type
-        if self.type == 'Xform':
+        if data['type'] == 'Xform':
             root_prim = UsdGeom.Xform.Define(stage, path)
-        elif self.type == 'Scope':
+        elif data['type'] == 'Scope':
             root_prim = UsdGeom.Scope.Define(stage, path)
-        elif self.type == 'SkelRoot':
+        elif data['type'] == 'SkelRoot':
             root_prim = UsdSkel.Root.Define(stage, path)
         else:
             root_prim = stage.DefinePrim(path)
 
-        for prim in input_stage.GetPseudoRoot().GetAllChildren():
-            override_prim = stage.OverridePrim(root_prim.GetPath().AppendChild(prim.GetName()))
-            override_prim.GetReferences().AddReference(input_stage.GetRootLayer().realPath, prim.GetPath())
+        usd_utils.add_references(stage, root_prim.GetPath(), input_stage,
+                                 input_stage.GetPseudoRoot().GetAllChildren())
 
         return stage
+
+    def set_parameters(self, stage):
+        if not self.name:
+            return False
+
+        root_prim = stage.GetPrimAtPath(f'/{Tf.MakeValidIdentifier(self.name)}')
+        if not root_prim:
+            return False
+
+        root_prim.SetTypeName('' if self.type == 'None' else self.type)
+        return True
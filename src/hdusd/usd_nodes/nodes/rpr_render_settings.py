@@ -22,6 +22,10 @@ class RprRenderSettingsNode(USDNode):
     bl_idname = 'usd.RprRenderSettingsNode'
     bl_label = "RPR Render Settings"
 
+    use_memo = False
+    is_reference_only = True
+    depends_on_input_prims = False
+
     render_mode: bpy.props.EnumProperty( 
         name='Render Mode',
         items=(('LOW', 'Low', "Raster only"),
@@ -21,6 +21,7 @@ from pxr import Usd, UsdGeom, Tf, Gf
 from .base_node import USDNode
 
 from ...export.object import get_transform
+from ...utils import usd as usd_utils
 
 class HDUSD_USD_NODETREE_OP_transform_add_empty(bpy.types.Operator):
     """Add new Empty object"""
@@ -46,9 +47,14 @@ class TransformNode(USDNode):
     bl_icon = "OBJECT_ORIGIN"
     bl_width_default = 250
 
+    is_reference_only = True
+
     def update_data(self, context):
         self.reset()
 
+    def update_transform(self, context):
+        self.update_parameters()
+
     name: bpy.props.StringProperty(
         name="Name",
         description="Xform name for USD root primitive",
@@ -56,9 +62,10 @@ class TransformNode(USDNode):
         update=update_data
     )
 
-    translation: bpy.props.FloatVectorProperty(update=update_data, unit='LENGTH')
-    rotation: bpy.props.FloatVectorProperty(update=update_data, unit='ROTATION')
-    scale: bpy.props.FloatVectorProperty(update=update_data, unit='NONE', default=(1.0, 1.0, 1.0))
+    translation: bpy.props.FloatVectorProperty(update=update_transform, unit='LENGTH')
+    rotation: bpy.props.FloatVectorProperty(update=update_transform, unit='ROTATION')
+    scale: bpy.props.FloatVectorProperty(update=update_transform, unit='NONE',
+                                         default=(1.0, 1.0, 1.0))
 
     def draw_buttons(self, context, layout):
         col = layout.column()
@@ -68,24 +75,31 @@ class TransformNode(USDNode):
         col.row().prop(self, 'rotation', text='Rotation')
         col.row().prop(self, 'scale', text='Scale')
 
-    def compute(self, **kwargs):
+    def get_compute_data(self, **kwargs):
         input_stage = self.get_input_link('Input', **kwargs)
-
         if not input_stage or not self.name:
             return None
 
-        path = f'/{Tf.MakeValidIdentifier(self.name)}'
-        stage = self.cached_stage.create()
+        return {'input_stage': input_stage, 'name': self.name, 'transform': self.get_transform()}
+
+    def compute_data(self, data, cached_stage):
+        input_stage = data['input_stage']
+        path = f'/{Tf.MakeValidIdentifier(data["name"])}'
+        stage = cached_stage.create()
         UsdGeom.SetStageMetersPerUnit(stage, 1)
         UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
         root_xform = UsdGeom.Xform.Define(stage, path)
         root_prim = root_xform.GetPrim()
 
-        for prim in input_stage.GetPseudoRoot().GetAllChildren():
-            override_prim = stage.OverridePrim(root_xform.GetPath().AppendChild(prim.GetName()))
-            override_prim.GetReferences().AddReference(input_stage.GetRootLayer().realPath,
-                                                       prim.GetPath())
+        usd_utils.add_references(stage, root_xform.GetPath(), input_stage,
+                                 input_stage.GetPseudoRoot().GetAllChildren())
 
+        UsdGeom.Xform.Get(stage, root_xform.GetPath()).AddTransformOp()
+        root_prim.GetAttribute('xformOp:transform').Set(data['transform'])
+
+        return stage
+
+    def get_transform(self):
         translation = Matrix.Translation((self.translation[:3]))
 
         diagonal = Matrix.Diagonal((self.scale[:3])).to_4x4()
@@ -95,11 +109,15 @@ class TransformNode(USDNode):
         rotation_z = Matrix.Rotation(self.rotation[2], 4, 'Z')
 
         transform = translation @ rotation_x @ rotation_y @ rotation_z @ diagonal
+        return Gf.Matrix4d(transform.transposed())
 
-        UsdGeom.Xform.Get(stage, root_xform.GetPath()).AddTransformOp()
-        root_prim.GetAttribute('xformOp:transform').Set(Gf.Matrix4d(transform.transposed()))
+    def set_parameters(self, stage):
+        root_prim = stage.GetPrimAtPath(f'/{Tf.MakeValidIdentifier(self.name)}')
+        if not root_prim:
+            return False
 
-        return stage
+        root_prim.GetAttribute('xformOp:transform').Set(self.get_transform())
+        return True
 
 
 class TransformByEmptyNode(USDNode):
@@ -108,6 +126,9 @@ class TransformByEmptyNode(USDNode):
     bl_label = "Transform by Empty object"
     bl_icon = "OBJECT_ORIGIN"
 
+    is_bpy_bound = True
+    is_reference_only = True
+
     def update_data(self, context):
         for sel_obj in context.selected_objects:
             sel_obj.select_set(False)
@@ -160,10 +181,8 @@ class TransformByEmptyNode(USDNode):
         root_xform = UsdGeom.Xform.Define(stage, path)
         root_prim = root_xform.GetPrim()
 
-        for prim in input_stage.GetPseudoRoot().GetAllChildren():
-            override_prim = stage.OverridePrim(root_xform.GetPath().AppendChild(prim.GetName()))
-            override_prim.GetReferences().AddReference(input_stage.GetRootLayer().realPath,
-                                                       prim.GetPath())
+        usd_utils.add_references(stage, root_xform.GetPath(), input_stage,
+                                 input_stage.GetPseudoRoot().GetAllChildren())
 
         if obj:
             UsdGeom.Xform.Get(stage, root_xform.GetPath()).AddTransformOp()
@@ -178,4 +197,5 @@ class TransformByEmptyNode(USDNode):
         obj = next((update.id for update in depsgraph.updates if isinstance(update.id, bpy.types.Object)
                     and not update.id.hdusd.is_usd and update.id.name == self.object.name), None)
         if obj:
+            self.data_changed()
             self.reset()
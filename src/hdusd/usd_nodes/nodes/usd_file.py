@@ -13,15 +13,66 @@
 # limitations under the License.
 # ********************************************************************
 import os
-import re
+import uuid
 
 import bpy
 from pxr import Usd, UsdGeom, Sdf, Gf
 
 from .base_node import USDNode
+from ... import config
+from .. import prim_matcher
+from .. import opened_stages
+from ...utils import usd as usd_utils
 from . import log
 
 
+def create_stage(cached_stage):
+    stage = cached_stage.create()
+    stage.SetInterpolationType(Usd.InterpolationTypeHeld)
+    UsdGeom.SetStageMetersPerUnit(stage, 1)
+    UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
+    return stage
+
+
+def deactivate_payload_prims(stage, input_stage, root_paths):
+    """
+    Deactivates prims of stage, which have payloads in input_stage opened without payloads.
+    root_paths is {path of input_stage prim: path of its prim in stage}.
+    """
+    layer = stage.GetRootLayer()
+    with Sdf.ChangeBlock():
+        for input_path, path in root_paths.items():
+            prim_range = iter(Usd.PrimRange(input_stage.GetPrimAtPath(input_path),
+                                            Usd.PrimAllPrimsPredicate))
+            for prim in prim_range:
+                if not prim.HasAuthoredPayloads():
+                    continue
+
+                # descendants of prim with payload are composed from the payload
+                prim_range.PruneChildren()
+                prim_path = prim.GetPath().ReplacePrefix(input_path, path)
+                Sdf.CreatePrimInLayer(layer, prim_path).active = False
+
+
+def check_composed_prims(stage, root_paths, is_unloaded):
+    """
+    Checks that stage, composed by next nodes and viewport engine with all payloads loaded,
+    contains only root prims of root_paths and, if is_unloaded, has no loaded payloads.
+    It is a dev check enabled by config.usd_nodes_strict_evaluation.
+    """
+    composed_stage = Usd.Stage.Open(stage.GetRootLayer(), Usd.Stage.LoadAll)
+    root_names = {prim.GetName() for prim in composed_stage.GetPseudoRoot().GetAllChildren()}
+    excluded_names = root_names - {path.name for path in root_paths.values()}
+    if excluded_names:
+        raise RuntimeError("Excluded prims of USD file are composed", stage, excluded_names)
+
+    if is_unloaded:
+        loaded_paths = [prim.GetPath() for prim in composed_stage.Traverse()
+                        if prim.HasAuthoredPayloads()]
+        if loaded_paths:
+            raise RuntimeError("Payloads of USD file are loaded", stage, loaded_paths)
+
+
 class UsdFileNode(USDNode):
     ''' read USD file '''
     bl_idname = 'usd.UsdFileNode'
@@ -51,26 +102,52 @@ class UsdFileNode(USDNode):
         update=update_data
     )
 
+    load_policy: bpy.props.EnumProperty(
+        name="Load",
+        description="Loading of USD payloads",
+        items=(('ALL', "All", "Load all payloads"),
+               ('NONE', "None", "Don't load payloads, prims with payloads are deactivated"),
+               ('ON_DEMAND', "On Demand", "Load payloads of prims matched to pattern only, "
+                                          "pattern is matched to the stage without payloads")),
+        default='ALL',
+        update=update_data
+    )
+
     def draw_buttons(self, context, layout):
         layout.prop(self, 'filename')
         layout.prop(self, 'filter_path')
+        layout.prop(self, 'load_policy')
 
-
-    def compute(self, **kwargs):
-        if not self.filename:
-            return None
-
+    def get_memo_properties(self):
+        # USD file could be changed on disk without changing node properties
         file_path = bpy.path.abspath(self.filename)
         if not os.path.isfile(file_path):
-            log.warn("Couldn't find USD file", self.filename, self)
-            return None
+            return super().get_memo_properties()
 
-        stage = Usd.Stage.Open(file_path)
-        self.cached_stage.insert(stage)
-        return stage
+        stat = os.stat(file_path)
+        return super().get_memo_properties() + ((stat.st_mtime, stat.st_size),)
+
+    @property
+    def user_key(self):
+        """
+        Key of this node in shared opened stages: session_uid of node tree and id of node,
+        it is kept when node or node tree is renamed
+        """
+        if not self.get('user_id'):
+            self['user_id'] = uuid.uuid4().hex
+
+        return self.id_data.session_uid, self['user_id']
 
+    def copy(self, node):
+        # copied node is another user of opened stages
+        self['user_id'] = ""
 
-    def compute(self, **kwargs):
+    def free(self):
+        super().free()
+        opened_stages.release_stage(self.user_key)
+
+    def get_file_key(self):
+        """Returns key of shared opened stage of USD file or None if file doesn't exist"""
         if not self.filename:
             return None
 
@@ -79,38 +156,90 @@ class UsdFileNode(USDNode):
             log.warn("Couldn't find USD file", self.filename, self)
             return None
 
-        input_stage = Usd.Stage.Open(file_path)
-
         if self.filter_path == '/*':
-            self.cached_stage.insert(input_stage)
-            return input_stage
-
-        # creating search regex pattern and getting filtered rpims
-        prog = re.compile(self.filter_path.replace('*', '#')        # temporary replacing '*' to '#'
-                          .replace('/', '\/')       # for correct regex pattern
-                          .replace('##', '[\w\/]*') # creation
-                          .replace('#', '\w*'))
+            # all root prims are matched, therefore loading on demand loads all payloads
+            load = Usd.Stage.LoadNone if self.load_policy == 'NONE' else Usd.Stage.LoadAll
+            return opened_stages.get_key(file_path, load)
+
+        # only subtree which could contain matched prims is populated
+        load = Usd.Stage.LoadAll if self.load_policy == 'ALL' else Usd.Stage.LoadNone
+        mask = prim_matcher.get_population_mask(self.filter_path)
+        return opened_stages.get_key(file_path, load, mask)
+
+    def restore_memo_stage(self, memo_key):
+        stage = super().restore_memo_stage(memo_key)
+        if stage and not opened_stages.has_user(self.user_key):
+            # stage was taken from memo cache without compute(), the node has to use
+            # opened stage of the file to be reset when the file is changed
+            key = self.get_file_key()
+            if key:
+                opened_stages.open_stage(self.user_key, key)
 
-        def get_child_prims(prim):
-            if not prim.IsPseudoRoot() and prog.fullmatch(str(prim.GetPath())):
-                yield prim
-                return
-
-            for child in prim.GetAllChildren():
-                yield from get_child_prims(child)
+        return stage
 
-        prims = tuple(get_child_prims(input_stage.GetPseudoRoot()))
-        if not prims:
+    def get_compute_data(self, **kwargs):
+        key = self.get_file_key()
+        if not key:
             return None
 
-        stage = self.cached_stage.create()
-        stage.SetInterpolationType(Usd.InterpolationTypeHeld)
-        UsdGeom.SetStageMetersPerUnit(stage, 1)
-        UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
-
-        root_prim = stage.GetPseudoRoot()
-        for i, prim in enumerate(prims, 1):
-            override_prim = stage.OverridePrim(root_prim.GetPath().AppendChild(prim.GetName()))
-            override_prim.GetReferences().AddReference(input_stage.GetRootLayer().realPath, prim.GetPath())
+        # file is opened in compute_data() if it isn't opened yet
+        input_stage = opened_stages.get_stage(self.user_key, key)
+        return {
+            'user': self.user_key,
+            'key': key,
+            'opened_stage': None,
+            'input_stage': input_stage,
+            'filter_path': self.filter_path,
+            'load_policy': self.load_policy,
+            'paths': prim_matcher.get_cached_paths(input_stage, self.filter_path)
+                     if input_stage else None,
+        }
+
+    def compute_data(self, data, cached_stage):
+        input_stage = data['input_stage']
+        if not input_stage:
+            data['opened_stage'] = opened_stages.OpenedStage(data['key'])
+            input_stage = data['input_stage'] = data['opened_stage'].stage
+
+        if data['filter_path'] == '/*':
+            if data['load_policy'] != 'NONE':
+                cached_stage.assign(input_stage)
+                return input_stage
+
+            # next nodes compose layer of node stage without load rules of opened stage,
+            # therefore prims with payloads are deactivated in own layer
+            stage = create_stage(cached_stage)
+            stage.GetRootLayer().subLayerPaths.append(input_stage.GetRootLayer().realPath)
+            root_paths = {prim.GetPath(): prim.GetPath()
+                          for prim in input_stage.GetPseudoRoot().GetAllChildren()}
+
+        else:
+            if data['paths'] is None:
+                matcher = prim_matcher.PrimPathMatcher(data['filter_path'])
+                data['paths'] = matcher.find_paths(input_stage)
+
+            if not data['paths']:
+                return None
+
+            # prims out of population mask aren't composed by next nodes,
+            # because only matched prims are referenced
+            stage = create_stage(cached_stage)
+            usd_utils.add_references(stage, stage.GetPseudoRoot().GetPath(), input_stage,
+                                     [input_stage.GetPrimAtPath(path) for path in data['paths']])
+            root_paths = {path: Sdf.Path.absoluteRootPath.AppendChild(path.name)
+                          for path in data['paths']}
+
+        if data['load_policy'] == 'NONE':
+            deactivate_payload_prims(stage, input_stage, root_paths)
+
+        if config.usd_nodes_strict_evaluation:
+            check_composed_prims(stage, root_paths, data['load_policy'] == 'NONE')
 
         return stage
+
+    def data_computed(self, data):
+        if data['opened_stage']:
+            opened_stages.add_stage(data['user'], data['opened_stage'])
+
+        if data['paths'] is not None:
+            prim_matcher.cache_paths(data['input_stage'], data['filter_path'], data['paths'])
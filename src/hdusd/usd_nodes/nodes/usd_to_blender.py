@@ -24,6 +24,7 @@ class USDToBlenderNode(USDNode):
     bl_label = "Insert USD to Blender"
 
     output_name = ""
+    is_bpy_bound = True
 
     write_type: bpy.props.EnumProperty( 
         name='Type',
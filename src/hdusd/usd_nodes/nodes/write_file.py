@@ -12,8 +12,131 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ********************************************************************
+from concurrent import futures
+from pathlib import Path
+import os
+import time
+
 import bpy
+from pxr import Sdf, UsdUtils
+
 from .base_node import USDNode
+from ...utils import get_temp_file, update_ui
+from . import log
+
+
+# delay of writing after last node compute, rapid edits don't queue redundant writes
+DEBOUNCE_TIME = 1.0
+POLL_INTERVAL = 0.2
+
+USD_EXTENSIONS = ('.usd', '.usda', '.usdc', '.usdz')
+
+# files are written one by one in single worker thread
+_executor = futures.ThreadPoolExecutor(max_workers=1)
+
+
+class BackgroundWrite:
+    """
+    Debounced writing of node stage to file by Blender timer. Node prepares writing
+    in main thread by get_write_task(), which returns (function, *args) or None.
+    The function is called in worker thread and returns status of writing.
+    """
+
+    def __init__(self, nodetree_name, node_name):
+        self.nodetree_name = nodetree_name
+        self.node_name = node_name
+
+        self.is_requested = False
+        self.future = None
+        self.status = ""
+
+        # keeping the same bound method to check timer registration
+        self._timer = self.update
+
+    def request(self, delay):
+        self.is_requested = True
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+
+        bpy.app.timers.register(self._timer, first_interval=delay)
+
+    def update(self):
+        if self.future:
+            if not self.future.done():
+                # new write waits until previous one is finished
+                return POLL_INTERVAL
+
+            self.status = self.future.result() or ""
+            self.future = None
+            update_ui('NODE_EDITOR', 'WINDOW')
+
+        if not self.is_requested:
+            return None
+
+        self.is_requested = False
+
+        nodetree = bpy.data.node_groups.get(self.nodetree_name)
+        node = nodetree.nodes.get(self.node_name) if nodetree else None
+        task = node.get_write_task() if node else None
+        if not task:
+            return None
+
+        self.status = "Writing..."
+        self.future = _executor.submit(*task)
+        return POLL_INTERVAL
+
+
+# {(nodetree name, node name): BackgroundWrite}
+_writes = {}
+
+
+def request_write(node, delay):
+    """Schedules writing of node stage after delay, see BackgroundWrite"""
+    key = (node.id_data.name, node.name)
+    background_write = _writes.get(key)
+    if not background_write:
+        background_write = BackgroundWrite(*key)
+        _writes[key] = background_write
+
+    background_write.request(delay)
+
+
+def get_write_status(node):
+    background_write = _writes.get((node.id_data.name, node.name))
+    return background_write.status if background_write else ""
+
+
+def write_usd_file(layer, file_path):
+    """Exports flattened layer to file_path, .usdz package is created from .usdc file"""
+    start_time = time.perf_counter()
+    try:
+        if file_path.lower().endswith('.usdz'):
+            usdc_path = str(get_temp_file(".usdc"))
+            layer.Export(usdc_path)
+            UsdUtils.CreateNewUsdzPackage(Sdf.AssetPath(usdc_path), file_path)
+            os.remove(usdc_path)
+        else:
+            layer.Export(file_path)
+
+    except Exception as e:
+        log.error("Couldn't write USD file", file_path, e)
+        return f"Error: {e}"
+
+    write_time = time.perf_counter() - start_time
+    size = os.path.getsize(file_path)
+    status = f"{size / 1024 / 1024:.2f} MB written in {write_time:.2f}s"
+    log.info("USD file written", file_path, status)
+    return status
+
+
+class HDUSD_USD_NODETREE_OP_write_file(bpy.types.Operator):
+    """Write USD file"""
+    bl_idname = "hdusd.usd_nodetree_write_file"
+    bl_label = "Write"
+
+    def execute(self, context):
+        context.node.write(0.0)
+        return {"FINISHED"}
 
 
 class WriteFileNode(USDNode):
@@ -22,16 +145,64 @@ class WriteFileNode(USDNode):
     bl_label = "Write USD File"
     bl_icon = "FILE_TICK"
 
+    # compute() schedules writing by Blender timer
+    use_memo = False
+
     file_path: bpy.props.StringProperty(name="USD File", subtype='FILE_PATH')
 
+    export_format: bpy.props.EnumProperty(
+        name="Format",
+        description="Format of written file if USD file path has no USD extension",
+        items=(('.usda', "Text (.usda)", "Human-readable text file"),
+               ('.usdc', "Binary (.usdc)", "Binary crate file, most efficient"),
+               ('.usdz', "Package (.usdz)", "Zip package with referenced assets")),
+        default='.usdc'
+    )
+
+    write_on_demand: bpy.props.BoolProperty(
+        name="Write On Demand",
+        description="Write file only by Write button instead of after each change",
+        default=False
+    )
+
     def draw_buttons(self, context, layout):
         layout.prop(self, 'file_path')
+        layout.prop(self, 'export_format')
+
+        row = layout.row()
+        row.prop(self, 'write_on_demand')
+        if self.write_on_demand:
+            row.operator(HDUSD_USD_NODETREE_OP_write_file.bl_idname, icon='FILE_TICK')
+
+        status = get_write_status(self)
+        if status:
+            layout.label(text=status)
+
+    def get_export_path(self):
+        """
+        Returns absolute path of written file. USD extension typed by user defines file format,
+        otherwise extension of selected format is appended.
+        """
+        file_path = Path(bpy.path.abspath(self.file_path))
+        if file_path.suffix.lower() in USD_EXTENSIONS:
+            return file_path
+
+        return file_path.with_name(file_path.name + self.export_format)
+
+    def write(self, delay=DEBOUNCE_TIME):
+        request_write(self, delay)
+
+    def get_write_task(self):
+        stage = self.cached_stage()
+        if not stage or not self.file_path:
+            return None
+
+        return write_usd_file, stage.Flatten(), str(self.get_export_path())
 
     def compute(self, **kwargs):
         stage = self.get_input_link('Input', **kwargs)
 
-        if stage and self.file_path:
-            file_path = bpy.path.abspath(self.file_path)
-            stage.Export(file_path)
+        if stage and self.file_path and not self.write_on_demand:
+            self.write()
 
         return stage
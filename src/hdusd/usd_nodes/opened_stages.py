@@ -0,0 +1,202 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+from collections import OrderedDict
+import os
+
+import bpy
+from pxr import Usd
+
+from ..utils.stage_cache import CachedStage
+from .memo import stage_changed
+
+from . import log
+
+
+# number of kept stages which aren't used by any node
+UNUSED_STAGES_COUNT = 8
+
+# interval of checking files of used stages in seconds
+WATCH_INTERVAL = 1.0
+
+
+def get_file_stat(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime, stat.st_size
+
+
+def get_key(file_path, load=Usd.Stage.LoadAll, mask=None):
+    """Returns key of stage opened from file_path with load rules and population mask"""
+    return os.path.normcase(os.path.realpath(file_path)), load, \
+        tuple(mask.GetPaths()) if mask else ()
+
+
+class OpenedStage:
+    """
+    Stage opened from file by key of get_key(). It doesn't access shared stages,
+    therefore it could be created in worker thread and added by add_stage() in main thread.
+    """
+    def __init__(self, key):
+        self.key = key
+        self.file_path, load, mask_paths = key
+        self.stat = get_file_stat(self.file_path)
+        if mask_paths:
+            stage = Usd.Stage.OpenMasked(self.file_path, Usd.StagePopulationMask(mask_paths), load)
+        else:
+            stage = Usd.Stage.Open(self.file_path, load)
+
+        self.cached_stage = CachedStage()
+        self.cached_stage.insert(stage)
+
+        # users are UsdFileNode.user_key
+        self.users = set()
+
+    @property
+    def stage(self):
+        return self.cached_stage()
+
+    def reload(self, stat):
+        log("Reloading USD file", self.file_path)
+        self.stat = stat
+        self.stage.Reload()
+        stage_changed(self.stage)
+
+
+# Stages opened from files are shared between USD nodes, reference counted by users
+# and reused across node resets. Files of used stages are watched by polling.
+# {(file path, load, mask paths): OpenedStage}, most recently used are at the end
+_stages = OrderedDict()
+
+# {user: OpenedStage}, stage of user could be not in _stages if the same file was opened
+# by several nodes in parallel, see add_stage()
+_users = {}
+
+
+def _remove_unused_stages():
+    unused_keys = [key for key, opened_stage in _stages.items() if not opened_stage.users]
+    for key in unused_keys[:max(0, len(unused_keys) - UNUSED_STAGES_COUNT)]:
+        _stages.pop(key).cached_stage.clear()
+
+
+def _release(user):
+    opened_stage = _users.pop(user, None)
+    if not opened_stage:
+        return
+
+    opened_stage.users.discard(user)
+    if not opened_stage.users and _stages.get(opened_stage.key) is not opened_stage:
+        opened_stage.cached_stage.clear()
+
+
+def _add_user(user, opened_stage):
+    opened_stage.users.add(user)
+    _users[user] = opened_stage
+    _remove_unused_stages()
+
+
+def get_stage(user, key):
+    """
+    Returns already opened stage by key and shares it with user,
+    returns None if stage has to be opened by OpenedStage
+    """
+    _release(user)
+
+    opened_stage = _stages.get(key)
+    if not opened_stage:
+        return None
+
+    if not opened_stage.stage:
+        del _stages[key]
+        return None
+
+    stat = get_file_stat(opened_stage.file_path)
+    if stat != opened_stage.stat:
+        opened_stage.reload(stat)
+
+    _stages.move_to_end(key)
+    _add_user(user, opened_stage)
+    return opened_stage.stage
+
+
+def add_stage(user, opened_stage):
+    """Shares stage, opened by OpenedStage, with user"""
+    _release(user)
+
+    registered_stage = _stages.get(opened_stage.key)
+    if not registered_stage or not registered_stage.stage:
+        _stages[opened_stage.key] = opened_stage
+
+    _add_user(user, opened_stage)
+
+
+def open_stage(user, key):
+    """Returns stage opened by key of get_key(), stage is shared with other users"""
+    stage = get_stage(user, key)
+    if stage:
+        return stage
+
+    opened_stage = OpenedStage(key)
+    add_stage(user, opened_stage)
+    return opened_stage.stage
+
+
+def has_user(user):
+    return user in _users
+
+
+def release_stage(user):
+    """User doesn't use opened stage anymore"""
+    _release(user)
+    _remove_unused_stages()
+
+
+def clear():
+    for opened_stage in {*_stages.values(), *_users.values()}:
+        opened_stage.cached_stage.clear()
+
+    _stages.clear()
+    _users.clear()
+
+
+def watch_files():
+    """Timer function: reloads changed files of used stages and resets nodes using them"""
+    changed_users = set()
+    for opened_stage in set(_users.values()):
+        try:
+            stat = get_file_stat(opened_stage.file_path)
+        except OSError:
+            # file was removed
+            changed_users.update(opened_stage.users)
+            if _stages.get(opened_stage.key) is opened_stage:
+                del _stages[opened_stage.key]
+
+            continue
+
+        if stat != opened_stage.stat:
+            opened_stage.reload(stat)
+            changed_users.update(opened_stage.users)
+
+    if not changed_users:
+        return WATCH_INTERVAL
+
+    for nodetree in bpy.data.node_groups:
+        if nodetree.bl_idname != 'hdusd.USDTree':
+            continue
+
+        for node in nodetree.nodes:
+            if node.bl_idname == 'usd.UsdFileNode' and node.get('user_id') and \
+                    (nodetree.session_uid, node['user_id']) in changed_users:
+                node.reset(True)
+
+    return WATCH_INTERVAL
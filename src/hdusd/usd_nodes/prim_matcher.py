@@ -0,0 +1,143 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+from collections import OrderedDict
+import re
+
+from pxr import Usd, Sdf
+
+from .memo import stage_key
+
+
+# max number of cached matched paths
+CACHE_SIZE = 64
+
+# {(stage key, pattern): tuple of matched Sdf.Path}
+_matched_paths = OrderedDict()
+
+
+def _pattern_to_regex(pattern):
+    """
+    Converts USD path pattern to regex, special characters:
+      * - any word or subword
+      ** - several words separated by '/' or subword
+    """
+    return (pattern.replace('*', '#')         # temporary replacing '*' to '#'
+                   .replace('/', r'\/')       # for correct regex pattern
+                   .replace('##', r'[\w\/]*') # creation
+                   .replace('#', r'\w*'))
+
+
+class PrimPathMatcher:
+    """Matches prim paths to USD path pattern and checks if descendants of prim could match"""
+
+    def __init__(self, pattern):
+        self.regex = re.compile(_pattern_to_regex(pattern))
+
+        # regexes of path names before first '**', deeper paths could match only after '**'
+        self.name_regexes = []
+        self.is_depth_limited = pattern.startswith('/') and '**' not in pattern
+        if pattern.startswith('/'):
+            for name in pattern[1:].split('/'):
+                if '**' in name:
+                    break
+
+                self.name_regexes.append(re.compile(_pattern_to_regex(name)))
+
+    def match(self, path):
+        return self.regex.fullmatch(str(path)) is not None
+
+    def can_match_descendants(self, path):
+        depth = path.pathElementCount
+        if depth <= len(self.name_regexes) and \
+                not self.name_regexes[depth - 1].fullmatch(path.name):
+            return False
+
+        if self.is_depth_limited:
+            return depth < len(self.name_regexes)
+
+        return True
+
+    def find_paths(self, stage):
+        """
+        Returns paths of prims matched to pattern. Descendants of matched prims aren't checked,
+        subtrees which couldn't match are pruned from traversal.
+        """
+        paths = []
+        prim_range = iter(Usd.PrimRange.Stage(stage, Usd.PrimAllPrimsPredicate))
+        for prim in prim_range:
+            path = prim.GetPath()
+            if self.match(path):
+                paths.append(path)
+                prim_range.PruneChildren()
+
+            elif not self.can_match_descendants(path):
+                prim_range.PruneChildren()
+
+        return tuple(paths)
+
+
+def get_population_mask(pattern):
+    """
+    Returns Usd.StagePopulationMask with the deepest path which includes all prims
+    matched to pattern, or None if the whole stage is required
+    """
+    if not pattern.startswith('/'):
+        return None
+
+    names = []
+    for name in pattern[1:].split('/'):
+        if '*' in name:
+            break
+
+        names.append(name)
+
+    path_str = '/' + '/'.join(names)
+    if not names or not Sdf.Path.IsValidPathString(path_str):
+        return None
+
+    return Usd.StagePopulationMask([Sdf.Path(path_str)])
+
+
+def _get_cache_key(stage, pattern):
+    # the same layer could be opened with different population mask or loaded payloads
+    return (stage_key(stage), pattern, tuple(stage.GetPopulationMask().GetPaths()),
+            tuple((path, rule) for path, rule in stage.GetLoadRules().GetRules()))
+
+
+def get_cached_paths(stage, pattern):
+    """Returns cached paths of prims of stage matched to pattern or None"""
+    key = _get_cache_key(stage, pattern)
+    paths = _matched_paths.get(key)
+    if paths is not None:
+        _matched_paths.move_to_end(key)
+
+    return paths
+
+
+def cache_paths(stage, pattern, paths):
+    """Caches paths of prims matched to pattern, found by PrimPathMatcher.find_paths()"""
+    _matched_paths[_get_cache_key(stage, pattern)] = paths
+    if len(_matched_paths) > CACHE_SIZE:
+        _matched_paths.popitem(last=False)
+
+
+def get_matched_prims(stage, pattern):
+    """Returns prims of stage matched to USD path pattern, matched paths are cached"""
+    paths = get_cached_paths(stage, pattern)
+    if paths is None:
+        paths = PrimPathMatcher(pattern).find_paths(stage)
+        cache_paths(stage, pattern, paths)
+
+    return tuple(stage.GetPrimAtPath(path) for path in paths)
@@ -60,7 +60,18 @@ def temp_pid_dir():
     d = temp_dir() / str(PID)
     if not d.is_dir():
         log("Creating image temp pid dir", d)
-        d.mkdir()
+        # could be called from several threads of USD nodes evaluator
+        d.mkdir(exist_ok=True)
+
+    return d
+
+
+def cache_dir():
+    """ Returns persistent hdusd cache dir in Blender user dir. Creates it if needed """
+    d = Path(bpy.utils.user_resource('CONFIG')).parent / "hdusd_cache"
+    if not d.is_dir():
+        log("Creating cache dir", d)
+        d.mkdir(parents=True)
 
     return d
 
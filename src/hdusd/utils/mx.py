@@ -31,6 +31,36 @@ MX_LIBS_DIR = LIBS_DIR / MX_LIBS_FOLDER
 os.environ['MATERIALX_SEARCH_PATH'] = str(MX_LIBS_DIR)
 
 
+# Process-wide document with MaterialX libraries of MxNode classes,
+# library files are loaded on first request of their nodedefs
+_lib_doc = None
+_lib_files = set()
+_lib_nodedefs = {}      # {nodedef name: nodedef}
+
+
+def get_lib_nodedef(file_path, nd_name):
+    """Returns nodedef from library file_path relative to LIBS_DIR"""
+    global _lib_doc
+
+    if file_path not in _lib_files:
+        if _lib_doc is None:
+            _lib_doc = mx.createDocument()
+
+        file_doc = mx.createDocument()
+        search_path = mx.FileSearchPath(str(MX_LIBS_DIR))
+        mx.readFromXmlFile(file_doc, str(LIBS_DIR / file_path), searchPath=search_path)
+
+        # elements already loaded from other library files are skipped by importLibrary
+        _lib_doc.importLibrary(file_doc)
+        for nd in file_doc.getNodeDefs():
+            _lib_nodedefs.setdefault(nd.getName(), _lib_doc.getNodeDef(nd.getName()))
+
+        _lib_files.add(file_path)
+        log("Library loaded", file_path)
+
+    return _lib_nodedefs.get(nd_name)
+
+
 def set_param_value(mx_param, val, nd_type, nd_output=None):
     if isinstance(val, mx.Node):
         param_nodegraph = mx_param.getParent().getParent()
@@ -0,0 +1,194 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+"""
+Profiler of USD and MaterialX node computations.
+It is disabled by default: compute methods of nodes are wrapped only while profiler is enabled,
+therefore disabled profiler doesn't add any overhead.
+"""
+import json
+import os
+import threading
+import time
+
+from pxr import Usd, Sdf
+
+from . import logging
+log = logging.Log('utils.profiler')
+
+
+# maximum number of trace events kept for Chrome trace export
+MAX_EVENTS = 100000
+
+
+class NodeStats:
+    calls = 0
+    total_time = 0.0    # wall time of node compute including computes of input nodes
+    self_time = 0.0     # wall time of node compute excluding computes of input nodes
+    prims = 0           # number of prims of last computed stage
+    specs = 0           # number of specs in root layer of last computed stage
+
+    def __init__(self, tree_name, node_name, tree_type):
+        self.tree_name = tree_name
+        self.node_name = node_name
+        self.tree_type = tree_type
+
+    def to_dict(self):
+        return {
+            'tree': self.tree_name,
+            'node': self.node_name,
+            'tree_type': self.tree_type,
+            'calls': self.calls,
+            'total_time': self.total_time,
+            'self_time': self.self_time,
+            'prims': self.prims,
+            'specs': self.specs,
+        }
+
+
+def get_stage_counts(stage):
+    """Returns number of prims of stage and number of specs in its root layer"""
+    prims_count = sum(1 for _ in stage.Traverse())
+    specs_count = 0
+
+    def count_spec(path):
+        nonlocal specs_count
+        specs_count += 1
+
+    stage.GetRootLayer().Traverse(Sdf.Path.absoluteRootPath, count_spec)
+    return prims_count, specs_count
+
+
+class Profiler:
+    def __init__(self):
+        self.is_enabled = False
+        self.stats = {}     # {(tree name, node name): NodeStats}
+        self.events = []    # complete events of Chrome trace format
+        self.start_time = time.perf_counter()
+
+        # time of nested computes of input nodes is accumulated in stack
+        self._stack = []
+        self._originals = []    # [(class, method name, original method)]
+
+    def _wrap(self, method):
+        profiler = self
+
+        def wrapper(node, *args, **kwargs):
+            stack = profiler._stack
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return_value = method(node, *args, **kwargs)
+
+            finally:
+                duration = time.perf_counter() - start
+                children_time = stack.pop()
+                if stack:
+                    stack[-1] += duration
+
+            profiler.record(node, start, duration, duration - children_time, return_value)
+            return return_value
+
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def record(self, node, start, duration, self_duration, return_value):
+        nodetree = node.id_data
+        key = (nodetree.name, node.name)
+
+        prims = specs = 0
+        if isinstance(return_value, Usd.Stage):
+            prims, specs = get_stage_counts(return_value)
+
+        stats = self.stats.get(key)
+        if not stats:
+            stats = self.stats[key] = NodeStats(*key, nodetree.bl_idname)
+
+        stats.calls += 1
+        stats.total_time += duration
+        stats.self_time += self_duration
+        if isinstance(return_value, Usd.Stage):
+            stats.prims = prims
+            stats.specs = specs
+
+        if len(self.events) < MAX_EVENTS:
+            self.events.append({
+                'name': node.name,
+                'cat': nodetree.bl_idname,
+                'ph': 'X',
+                'ts': (start - self.start_time) * 1e6,
+                'dur': duration * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': {'tree': nodetree.name, 'node_type': node.bl_idname,
+                         'prims': prims, 'specs': specs},
+            })
+
+    def enable(self):
+        if self.is_enabled:
+            return
+
+        from ..usd_nodes.nodes.base_node import USDNode
+        from ..mx_nodes.nodes.base_node import MxNode
+
+        # USDNode.compute_stage is the computing part of USDNode.final_compute,
+        # stage of which is taken from memo cache or computed by compute()
+        for cls, name in ((USDNode, 'compute_stage'), (MxNode, 'compute')):
+            method = cls.__dict__[name]
+            self._originals.append((cls, name, method))
+            setattr(cls, name, self._wrap(method))
+
+        self.is_enabled = True
+        log.info("Profiler enabled")
+
+    def disable(self):
+        if not self.is_enabled:
+            return
+
+        for cls, name, method in self._originals:
+            setattr(cls, name, method)
+
+        self._originals.clear()
+        self.is_enabled = False
+        log.info("Profiler disabled")
+
+    def clear(self):
+        self.stats.clear()
+        self.events.clear()
+        self.start_time = time.perf_counter()
+
+    def get_stats(self, tree_name=None):
+        """Returns stats of nodes sorted by self time, of all trees or of tree_name only"""
+        stats = [s for s in self.stats.values() if tree_name is None or s.tree_name == tree_name]
+
+        return sorted(stats, key=lambda s: s.self_time, reverse=True)
+
+    def export_json(self, file_path):
+        data = {'nodes': [s.to_dict() for s in self.get_stats()]}
+        with open(file_path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+        log.info("Profiler stats exported", file_path)
+
+    def export_chrome_trace(self, file_path):
+        """Exports trace events which could be opened in chrome://tracing or Perfetto"""
+        data = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+        with open(file_path, 'w') as f:
+            json.dump(data, f)
+
+        log.info("Profiler trace exported", file_path)
+
+
+profiler = Profiler()
@@ -46,6 +46,26 @@ class CachedStage:
         self.clear()
         self.id = _stage_cache.GetId(stage).ToLongInt()
 
+    def restore(self, stage):
+        """
+        Puts previously computed stage back to cache.
+        Returns False if stage is still cached and used by other CachedStage.
+        """
+        if _stage_cache.Contains(stage):
+            return False
+
+        self.insert(stage)
+        return True
+
+    def transfer(self, cached_stage):
+        """Takes stage and its ownership from other cached_stage"""
+        self.clear()
+        self.id = cached_stage.id
+        self.is_owner = cached_stage.is_owner
+
+        cached_stage.id = ID_NO_STAGE
+        cached_stage.is_owner = False
+
     def clear(self):
         if self.is_owner:
             _stage_cache.Erase(Usd.StageCache.Id.FromLongInt(self.id))
@@ -17,7 +17,7 @@ import math
 import mathutils
 import bpy
 
-from pxr import UsdShade
+from pxr import UsdShade, Sdf
 
 
 def get_xform_transform(xform):
@@ -78,3 +78,45 @@ def bind_material(mesh_prim, usd_mat):
     bindings.UnbindAllBindings()
     if usd_mat:
         bindings.Bind(usd_mat)
+
+
+def add_references(stage, parent_path, ref_stage, prims):
+    """
+    Adds over prims as children of parent_path referencing prims of ref_stage.
+    Specs are authored with Sdf API in one change block, so stage is recomposed once.
+    """
+    layer = stage.GetRootLayer()
+    ref_layer_path = ref_stage.GetRootLayer().realPath
+
+    with Sdf.ChangeBlock():
+        for prim in prims:
+            prim_spec = Sdf.CreatePrimInLayer(layer, parent_path.AppendChild(prim.GetName()))
+            prim_spec.referenceList.prependedItems.append(
+                Sdf.Reference(ref_layer_path, prim.GetPath()))
+
+
+def _get_sublayers(layer):
+    return [sublayer for sublayer in (Sdf.Layer.FindOrOpen(layer.ComputeAbsolutePath(path))
+                                      for path in layer.subLayerPaths) if sublayer]
+
+
+def _is_defined_in_layer_stack(layer, path):
+    return bool(layer.GetPrimAtPath(path)) or \
+        any(_is_defined_in_layer_stack(sublayer, path) for sublayer in _get_sublayers(layer))
+
+
+def get_prim_source_layer(layer, path):
+    """
+    Returns layer of layer stack of root layer, which is enough to compose prim at path.
+    Prims of merged stages are defined only in one sublayer, so the sublayer is returned,
+    its identity isn't changed when other sublayers are replaced.
+    """
+    while not layer.GetPrimAtPath(path):
+        sublayers = [sublayer for sublayer in _get_sublayers(layer)
+                     if _is_defined_in_layer_stack(sublayer, path)]
+        if len(sublayers) != 1:
+            break
+
+        layer = sublayers[0]
+
+    return layer
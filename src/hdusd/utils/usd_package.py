@@ -0,0 +1,309 @@
+# **********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ********************************************************************
+"""
+Export of USD layer with all its dependencies: referenced layers, MaterialX files,
+MaterialX libraries and textures. Dependency graph is built first, then files are written
+in thread pool. Files are deduplicated by content hash and files already present
+in destination with the same content are not rewritten.
+"""
+from concurrent import futures
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import MaterialX as mx
+from pxr import Sdf
+
+from . import LIBS_DIR, temp_pid_dir
+from .mx import MX_LIBS_DIR, MX_LIBS_FOLDER
+
+from . import logging
+log = logging.Log('utils.usd_package')
+
+
+TEXTURES_DIR_NAME = "textures"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# hashes of file contents: {file path: (mtime, size, hash)}
+_file_hashes = {}
+_file_hashes_lock = threading.Lock()
+
+
+def file_hash(file_path):
+    """Returns hash of file content, hash is recalculated only if file was changed"""
+    file_path = str(file_path)
+    stat = os.stat(file_path)
+    with _file_hashes_lock:
+        cached = _file_hashes.get(file_path)
+
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    h = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(chunk)
+
+    digest = h.hexdigest()
+    with _file_hashes_lock:
+        _file_hashes[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+    return digest
+
+
+def copy_file(source_path, dest_path):
+    """Copies file unless destination file has the same content. Returns True if file was copied"""
+    if dest_path.is_file() and file_hash(dest_path) == file_hash(source_path):
+        return False
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(source_path, dest_path)
+    log(f"Export file {source_path} to {dest_path}: completed successfuly")
+    return True
+
+
+def write_file(dest_path, write):
+    """
+    Writes file through write(file_path) to temporary file, which replaces destination file
+    only if their contents differ. Returns True if destination file was changed
+    """
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = dest_path.parent / f".{dest_path.stem}.tmp{dest_path.suffix}"
+    write(str(temp_path))
+
+    if dest_path.is_file() and file_hash(dest_path) == file_hash(temp_path):
+        os.remove(temp_path)
+        return False
+
+    os.replace(temp_path, dest_path)
+    log(f"Export file {dest_path}: completed successfuly")
+    return True
+
+
+def rel_asset_path(dest_path, dir_path):
+    path = Path(os.path.relpath(dest_path, dir_path)).as_posix()
+    return path if path.startswith('.') else f"./{path}"
+
+
+class LayerData:
+    """Node of dependency graph: layer, its destination and destinations of its dependencies"""
+
+    def __init__(self, layer, source_dir, dest_path, prefix):
+        self.layer = layer
+        self.source_dir = source_dir
+        self.dest_path = dest_path
+        self.prefix = prefix        # relative dir of dependencies of not temporary layers
+        self.refs = {}              # {asset path: destination path}
+
+
+class MxData:
+    def __init__(self, source_path, dest_path):
+        self.source_path = source_path
+        self.dest_path = dest_path
+        self.doc = None
+        self.textures = {}      # {mx input: texture source path}
+
+
+class PackageExport:
+    def __init__(self, file_path):
+        self.dest_dir = Path(file_path).parent
+        self.file_path = Path(file_path)
+        self.temp_dir = temp_pid_dir()
+
+        self.layers = {}        # {layer source path: LayerData}
+        self.mx_files = {}      # {mtlx source path: MxData}
+        self.dest_paths = set()
+
+    def _get_dest_path(self, dest_path):
+        """Returns unique destination path, dependencies with the same name get index suffix"""
+        i = 0
+        unique_path = dest_path
+        while unique_path in self.dest_paths:
+            i += 1
+            unique_path = dest_path.parent / f"{dest_path.stem}_{i}{dest_path.suffix}"
+
+        self.dest_paths.add(unique_path)
+        return unique_path
+
+    def build_graph(self, root_layer, source_dir):
+        root_data = LayerData(root_layer, source_dir, self.file_path, Path())
+        self.dest_paths.add(self.file_path)
+
+        layers_to_check = [root_data]
+        while layers_to_check:
+            data = layers_to_check.pop()
+            for ref in data.layer.GetCompositionAssetDependencies():
+                ref_path = Path(ref)
+                source_path = Path(os.path.normpath(
+                    ref_path if ref_path.is_absolute() else data.source_dir / ref_path))
+                key = str(source_path)
+
+                if ref_path.suffix == ".mtlx":
+                    if key not in self.mx_files:
+                        self.mx_files[key] = MxData(
+                            source_path, self._get_dest_path(self.dest_dir / source_path.name))
+
+                    data.refs[ref] = self.mx_files[key].dest_path
+                    continue
+
+                if key not in self.layers:
+                    layer = Sdf.Layer.FindOrOpen(key)
+                    if not layer:
+                        log.warn("Unable to open layer", source_path)
+                        continue
+
+                    # temporary layers are placed near the root layer, other layers keep
+                    # relative paths between each other
+                    if self.temp_dir in source_path.parents:
+                        prefix = data.prefix
+                        dest_path = self.dest_dir / source_path.name
+                    else:
+                        prefix = data.prefix / (source_path.parent.name if ref_path.is_absolute()
+                                                else ref_path.parent)
+                        dest_path = self.dest_dir / prefix / source_path.name
+
+                    ref_data = LayerData(layer, source_path.parent,
+                                         self._get_dest_path(dest_path), prefix)
+                    self.layers[key] = ref_data
+                    layers_to_check.append(ref_data)
+
+                data.refs[ref] = self.layers[key].dest_path
+
+        return root_data
+
+    def _export_layer(self, data):
+        refs = {ref: rel_asset_path(dest_path, data.dest_path.parent)
+                for ref, dest_path in data.refs.items()}
+
+        if not refs and not data.layer.dirty and data.layer.realPath:
+            return copy_file(Path(data.layer.realPath), data.dest_path)
+
+        layer = Sdf.Layer.CreateAnonymous(data.dest_path.suffix)
+        layer.TransferContent(data.layer)
+        for ref, path in refs.items():
+            if ref != path:
+                layer.UpdateCompositionAssetDependency(ref, path)
+
+        return write_file(data.dest_path, layer.Export)
+
+    @staticmethod
+    def _read_mx_file(data):
+        doc = mx.createDocument()
+        search_path = mx.FileSearchPath(str(data.source_path.parent))
+        search_path.append(str(MX_LIBS_DIR))
+        mx.readFromXmlFile(doc, str(data.source_path), searchPath=search_path)
+
+        for mx_input in doc.traverseTree():
+            if not isinstance(mx_input, mx.Input) or mx_input.getType() != 'filename':
+                continue
+
+            mx_value = mx_input.getValue()
+            if not mx_value:
+                log.warn(f"Skipping wrong {mx_input.getType()} input value. Expected: path, got {mx_value}")
+                continue
+
+            texture_path = Path(mx_value)
+            if not texture_path.is_absolute():
+                texture_path = data.source_path.parent / texture_path
+
+            if not texture_path.is_file():
+                log.warn("Image is missing", texture_path)
+                continue
+
+            data.textures[mx_input] = texture_path
+
+        data.doc = doc
+
+    def _get_mx_deps(self, doc):
+        """Returns paths of MaterialX library files relative to LIBS_DIR, which doc depends on"""
+        from ..mx_nodes.nodes import mx_node_classes_by_category
+
+        categories = set(node.getCategory() for node in doc.traverseTree()
+                         if isinstance(node, mx.Node))
+        return set(cls._file_path for category in categories
+                   for cls in mx_node_classes_by_category.get(category, ()))
+
+    def _write_mx_file(self, data, texture_dest_paths, mx_deps):
+        mx_dir = data.dest_path.parent
+        for mx_input, texture_path in data.textures.items():
+            mx_input.setValue(Path(os.path.relpath(texture_dest_paths[texture_path], mx_dir)).as_posix(),
+                              mx_input.getType())
+
+        for lib_path in mx_deps:
+            mx.prependXInclude(data.doc, Path(os.path.relpath(lib_path, mx_dir)).as_posix())
+
+        return write_file(data.dest_path, lambda path: mx.writeToXmlFile(data.doc, path))
+
+    def export(self, root_layer, source_dir):
+        root_data = self.build_graph(root_layer, source_dir)
+        log(f"Export package {self.file_path}: {len(self.layers) + 1} layers, "
+            f"{len(self.mx_files)} MaterialX files")
+
+        with futures.ThreadPoolExecutor() as executor:
+            # MaterialX files are read first to collect textures and libraries they depend on
+            list(executor.map(self._read_mx_file, self.mx_files.values()))
+
+            texture_paths = sorted(set(path for data in self.mx_files.values()
+                                       for path in data.textures.values()))
+            texture_hashes = dict(zip(texture_paths, executor.map(file_hash, texture_paths)))
+
+            # textures with the same content are exported once
+            texture_dest_paths = {}
+            hash_dest_paths = {}
+            for texture_path, texture_hash in texture_hashes.items():
+                if texture_hash not in hash_dest_paths:
+                    hash_dest_paths[texture_hash] = (texture_path, self._get_dest_path(
+                        self.dest_dir / TEXTURES_DIR_NAME / texture_path.name))
+
+                texture_dest_paths[texture_path] = hash_dest_paths[texture_hash][1]
+
+            lib_dest_paths = {}
+            mx_files_deps = {}
+            for key, data in self.mx_files.items():
+                deps = self._get_mx_deps(data.doc)
+                for lib_path in deps:
+                    rel_path = Path(lib_path)
+                    if rel_path.parts[0] == MX_LIBS_FOLDER:
+                        rel_path = rel_path.relative_to(MX_LIBS_FOLDER)
+
+                    lib_dest_paths[lib_path] = self.dest_dir / rel_path
+
+                mx_files_deps[key] = [lib_dest_paths[lib_path] for lib_path in sorted(deps)]
+
+            tasks = [
+                *(executor.submit(copy_file, source_path, dest_path)
+                  for source_path, dest_path in hash_dest_paths.values()),
+                *(executor.submit(copy_file, LIBS_DIR / lib_path, dest_path)
+                  for lib_path, dest_path in lib_dest_paths.items()),
+                *(executor.submit(self._write_mx_file, data, texture_dest_paths, mx_files_deps[key])
+                  for key, data in self.mx_files.items()),
+                *(executor.submit(self._export_layer, data)
+                  for data in (root_data, *self.layers.values())),
+            ]
+
+            changed_count = sum(1 for task in tasks if task.result())
+
+        log.info(f"Export package {self.file_path}: {changed_count} of {len(tasks)} files written, "
+                 f"{len(texture_paths) - len(hash_dest_paths)} duplicated textures skipped")
+
+
+def export_package(root_layer, file_path, source_dir):
+    """
+    Exports root_layer to file_path with all its dependencies.
+    Relative dependencies of root layer are resolved against source_dir.
+    """
+    PackageExport(file_path).export(root_layer, Path(source_dir))
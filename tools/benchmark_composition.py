@@ -0,0 +1,168 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Benchmark of composition used by Merge/Root/Transform/Filter USD nodes.
+Compares authoring of one reference per root prim through Usd API with
+Sdf change block authoring and sublayer composition.
+
+Usage:
+    blender -b --factory-startup --python benchmark_composition.py -- -prims 10000
+    blender --python benchmark_composition.py -- -prims 10000 -hydra   # HdStorm requires OpenGL
+
+Sdf authoring is measured by hdusd.utils.usd.add_references() from src folder of repo,
+therefore benchmark is run by Blender.
+"""
+import sys
+import os
+import platform
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+
+OS = platform.system()
+LIBS_DIR = Path(__file__).parent.parent / 'libs'
+
+if OS == 'Windows':
+    for loc_path in ('lib', 'bin', 'plugin/usd'):
+        os.add_dll_directory(str(LIBS_DIR / loc_path))
+
+os.environ['PXR_PLUGINPATH_NAME'] = str(LIBS_DIR / 'plugin')
+sys.path.append(str(LIBS_DIR / 'lib/python'))
+sys.path.append(str(LIBS_DIR / 'python'))
+
+from pxr import Usd, UsdGeom, Sdf, Gf
+
+sys.path.append(str((Path(__file__).parent.parent / 'src').resolve()))
+from hdusd.utils.usd import add_references
+
+
+temp_dir = Path(tempfile.mkdtemp(prefix="hdusd_benchmark_"))
+temp_index = 0
+
+
+def create_stage():
+    global temp_index
+    temp_index += 1
+    stage = Usd.Stage.CreateNew(str(temp_dir / f"stage{temp_index}.usda"))
+    UsdGeom.SetStageMetersPerUnit(stage, 1)
+    UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
+    return stage
+
+
+def create_input_stage(prims_count):
+    stage = create_stage()
+    with Sdf.ChangeBlock():
+        for i in range(prims_count):
+            xform = UsdGeom.Xform.Define(stage, f"/Object{i}")
+            xform.AddTranslateOp().Set(Gf.Vec3d(i % 100, i // 100, 0.0))
+            UsdGeom.Cube.Define(stage, f"/Object{i}/Cube").GetSizeAttr().Set(0.5)
+
+    return stage
+
+
+def references_usd(stage, parent_path, ref_stage, prims):
+    """Previous approach: override prim and reference through Usd API per root prim"""
+    for prim in prims:
+        override_prim = stage.OverridePrim(parent_path.AppendChild(prim.GetName()))
+        override_prim.GetReferences().AddReference(ref_stage.GetRootLayer().realPath,
+                                                   prim.GetPath())
+
+
+def merge_references(input_stages):
+    stage = create_stage()
+    for input_stage in input_stages:
+        references_usd(stage, Sdf.Path.absoluteRootPath, input_stage,
+                       input_stage.GetPseudoRoot().GetAllChildren())
+
+    return stage
+
+
+def merge_sublayers(input_stages):
+    stage = create_stage()
+    stage.GetRootLayer().subLayerPaths = [input_stage.GetRootLayer().realPath
+                                          for input_stage in input_stages]
+    return stage
+
+
+def transform(input_stage, add_references_func):
+    stage = create_stage()
+    root_xform = UsdGeom.Xform.Define(stage, "/Transform")
+    add_references_func(stage, root_xform.GetPath(), input_stage,
+                        input_stage.GetPseudoRoot().GetAllChildren())
+    root_xform.AddTransformOp().Set(Gf.Matrix4d(1.0).SetTranslate(Gf.Vec3d(0.0, 0.0, 1.0)))
+    return stage
+
+
+def measure(name, func, *args):
+    start = time.perf_counter()
+    stage = func(*args)
+    compose_time = time.perf_counter() - start
+
+    # traversal forces composition of all prims
+    start = time.perf_counter()
+    prims_count = sum(1 for _ in stage.Traverse())
+    traverse_time = time.perf_counter() - start
+
+    print(f"{name:<32} compose: {compose_time:8.3f}s  traverse: {traverse_time:8.3f}s  "
+          f"prims: {prims_count}")
+    return stage
+
+
+def measure_hydra(name, stage):
+    from pxr import UsdImagingGL
+
+    engine = UsdImagingGL.Engine()
+    params = UsdImagingGL.RenderParams()
+    engine.SetRenderViewport((0, 0, 64, 64))
+
+    # first render call populates Hydra render index with all stage prims
+    start = time.perf_counter()
+    engine.Render(stage.GetPseudoRoot(), params)
+    populate_time = time.perf_counter() - start
+    print(f"{name:<32} hydra population: {populate_time:8.3f}s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-prims", required=False, type=int, default=10000,
+                    help="Number of root prims of input stage")
+    ap.add_argument("-hydra", required=False, action="store_true",
+                    help="Measure Hydra population time, requires OpenGL context")
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = ap.parse_args(argv)
+
+    input_stages = [create_input_stage(args.prims // 2),
+                    create_input_stage(args.prims - args.prims // 2)]
+    print(f"Root prims: {args.prims}, temp dir: {temp_dir}")
+
+    stages = {
+        "Merge (references)": measure("Merge (references)", merge_references, input_stages),
+        "Merge (sublayers)": measure("Merge (sublayers)", merge_sublayers, input_stages),
+    }
+    merged_stage = stages["Merge (sublayers)"]
+    stages["Transform (Usd references)"] = measure("Transform (Usd references)", transform,
+                                                   merged_stage, references_usd)
+    stages["Transform (Sdf references)"] = measure("Transform (Sdf references)", transform,
+                                                   merged_stage, add_references)
+
+    if args.hydra:
+        for name, stage in stages.items():
+            measure_hydra(name, stage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Benchmark of USD Hydra addon startup: import and register time broken down by subsystem.
+Registration of MaterialX node families, which is done on demand, is measured separately.
+Addon must not be enabled in Blender preferences, it is loaded from src folder of repo.
+
+Usage:
+    blender -b --factory-startup --python benchmark_startup.py
+"""
+import sys
+import time
+import importlib.abc
+from collections import defaultdict
+from pathlib import Path
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Measures self time of executing addon modules, nested imports are excluded"""
+
+    def __init__(self, package):
+        self.package = package
+        self.times = defaultdict(float)     # {subsystem: time}
+        self.stack = []
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != self.package and not fullname.startswith(f"{self.package}."):
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec:
+                break
+        else:
+            return None
+
+        exec_module = spec.loader.exec_module
+        subsystem = fullname.split('.')[1] if '.' in fullname else "(init)"
+
+        def timed_exec_module(module):
+            self.stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+
+            finally:
+                duration = time.perf_counter() - start
+                nested_time = self.stack.pop()
+                if self.stack:
+                    self.stack[-1] += duration
+
+                self.times[subsystem] += duration - nested_time
+
+        spec.loader.exec_module = timed_exec_module
+        return spec
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def print_times(title, times):
+    print(f"{title}: {sum(times.values()):.3f} s")
+    for name, t in sorted(times.items(), key=lambda item: item[1], reverse=True):
+        print(f"    {name:<16} {t:.3f} s")
+
+
+def main():
+    sys.path.append(str((Path(__file__).parent.parent / 'src').resolve()))
+
+    import_timer = ImportTimer('hdusd')
+    sys.meta_path.insert(0, import_timer)
+    import_time = timed(lambda: importlib.import_module('hdusd'))
+    sys.meta_path.remove(import_timer)
+
+    import hdusd
+    from hdusd.mx_nodes import nodes as mx_nodes
+
+    # the same order as in hdusd.register()
+    subsystems = ('engine', 'bl_nodes', 'mx_nodes', 'usd_nodes', 'properties', 'ui')
+    register_times = {name: timed(getattr(hdusd, name).register) for name in subsystems}
+
+    families_times = {name: timed(lambda: mx_nodes.register_family(name))
+                      for name in mx_nodes.mx_node_families}
+
+    print(f"Import: {import_time:.3f} s")
+    print_times("Import self time of modules", import_timer.times)
+    print_times("Register", register_times)
+    print_times("On demand registration of MaterialX node families", families_times)
+
+    hdusd.unregister()
+
+
+if __name__ == "__main__":
+    main()
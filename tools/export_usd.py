@@ -0,0 +1,148 @@
+#**********************************************************************
+# Copyright 2020 Advanced Micro Devices, Inc
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#********************************************************************
+"""
+Headless export of .blend files to USD, several files are exported per one Blender launch.
+Exports stage of output node of USD node tree, or whole scene through Blender Data node
+if node tree isn't set or doesn't exist in .blend file. Each file is exported to its own
+subdirectory of output dir together with its dependencies: referenced layers,
+MaterialX files and textures, so the exported package doesn't depend on addon temp dir.
+
+Usage:
+    blender -b --factory-startup --python export_usd.py -- -i scene1.blend scene2.blend -o out_dir
+    blender -b --python export_usd.py -- -i scene.blend -o out_dir -tree USD -format .usda
+
+If USD Hydra addon isn't enabled in Blender preferences, it is loaded from src folder of repo.
+Load time includes computation of USD node trees, which is done by addon after file loading.
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+import bpy
+
+
+def load_addon():
+    if 'hdusd' in bpy.context.preferences.addons:
+        import hdusd
+        return hdusd
+
+    sys.path.append(str((Path(__file__).parent.parent / 'src').resolve()))
+
+    import hdusd
+    hdusd.register()
+    return hdusd
+
+
+def get_stage(tree_name):
+    """Returns computed stage of USD node tree output node, or stage of scene"""
+    nodetree = bpy.data.node_groups.get(tree_name) if tree_name else None
+    if nodetree and nodetree.bl_idname == 'hdusd.USDTree':
+        output_node = nodetree.get_output_node()
+        if not output_node:
+            print(f"  Node tree '{tree_name}' has no output node")
+            return None
+
+        return output_node.final_compute()
+
+    if tree_name:
+        print(f"  Node tree '{tree_name}' not found, exporting scene")
+
+    nodetree = bpy.data.node_groups.new("USD Export", type='hdusd.USDTree')
+    node = nodetree.nodes.new('usd.BlenderDataNode')
+    node.data = 'SCENE'
+    return node.final_compute()
+
+
+def export_file(blend_file, output_dir, tree_name, export_format):
+    times = {}
+
+    start = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=str(blend_file), load_ui=False)
+    bpy.context.scene.render.engine = 'HdUSD'
+    times['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stage = get_stage(tree_name)
+    times['evaluate'] = time.perf_counter() - start
+    if not stage:
+        print(f"  Nothing to export from {blend_file}")
+        return None
+
+    from hdusd.utils import temp_pid_dir, usd_package
+
+    start = time.perf_counter()
+    usd_file = output_dir / blend_file.stem / f"{blend_file.stem}{export_format}"
+    root_layer = stage.GetRootLayer()
+    source_dir = Path(root_layer.realPath).parent if root_layer.realPath else temp_pid_dir()
+    usd_package.export_package(root_layer, usd_file, source_dir)
+    times['export'] = time.perf_counter() - start
+
+    print(f"  Exported {usd_file}")
+    return times
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    ap = argparse.ArgumentParser(prog="blender -b --python export_usd.py --")
+    ap.add_argument("-i", required=True, nargs='+', type=Path,
+                    help=".blend files to export")
+    ap.add_argument("-o", required=True, type=Path,
+                    help="Output directory of exported USD files")
+    ap.add_argument("-tree", required=False, type=str, default="",
+                    help="Name of USD node tree to export, scene is exported if not set")
+    ap.add_argument("-format", required=False, type=str, default=".usdc",
+                    choices=(".usda", ".usdc"), help="Format of exported USD files")
+    args = ap.parse_args(argv)
+
+    start = time.perf_counter()
+    load_addon()
+    print(f"Addon loaded: {time.perf_counter() - start:.2f} s")
+
+    args.o.mkdir(parents=True, exist_ok=True)
+
+    failed = []
+    total_times = {}
+    for blend_file in args.i:
+        print(f"Exporting {blend_file}")
+        try:
+            times = export_file(blend_file.resolve(), args.o, args.tree, args.format)
+
+        except Exception as e:
+            print(f"  Failed to export {blend_file}: {e}")
+            times = None
+
+        if not times:
+            failed.append(blend_file)
+            continue
+
+        print("  " + ", ".join(f"{name}: {t:.2f} s" for name, t in times.items()))
+        for name, t in times.items():
+            total_times[name] = total_times.get(name, 0.0) + t
+
+    print(f"Exported {len(args.i) - len(failed)} of {len(args.i)} files "
+          f"in {time.perf_counter() - start:.2f} s")
+    if total_times:
+        print("Total " + ", ".join(f"{name}: {t:.2f} s" for name, t in total_times.items()))
+
+    for blend_file in failed:
+        print(f"Failed: {blend_file}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()